@@ -0,0 +1,202 @@
+"""Benchmarks for loading, iterating, validating and exporting.
+
+Generates synthetic workbooks with the pycargo fields, times every
+stage and tracks its peak memory with tracemalloc. Results can be
+saved as a baseline and later runs are compared against it.
+
+    $ python benchmarks/run.py --rows 10000 100000 --width narrow wide
+    $ python benchmarks/run.py --rows 1000000 --error-rate 0.05 --memory
+    $ python benchmarks/run.py --save-baseline
+    $ python benchmarks/run.py --compare --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pycargo import fields, validate  # noqa: E402
+from pycargo.containers import RowIterator, RowStore  # noqa: E402
+from pycargo.spreadsheet import SpreadSheet  # noqa: E402
+
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+STATUSES = ["active", "inactive", "pending"]
+WIDE_COLUMNS = 20
+
+
+def spreadsheet_class(width: str) -> typing.Type[SpreadSheet]:
+    attrs = {
+        "name": fields.StringField(validate=validate.Required()),
+        "code": fields.IntegerField(
+            validate=[validate.Required(), validate.Range(min=0)],
+            data_key="Code",
+        ),
+        "price": fields.FloatField(validate=validate.Range(min=0)),
+        "status": fields.StringField(validate=validate.OneOf(STATUSES)),
+        "created_on": fields.DateTimeField(),
+    }
+    if width == "wide":
+        for idx in range(WIDE_COLUMNS):
+            attrs[f"extra_{idx}"] = fields.IntegerField()
+    return type(f"{width.title()}SpreadSheet", (SpreadSheet,), attrs)
+
+
+def generate_data(
+    rows: int, width: str, error_rate: float, seed: int = 0
+) -> pd.DataFrame:
+    """Dataframe keyed by field names where about error_rate of the
+    cells hold invalid values.
+    """
+    rng = np.random.default_rng(seed)
+    data = {
+        "name": rng.choice(["Foo", "Bar", "Baz"], rows).astype(object),
+        "code": rng.integers(0, 10**6, rows).astype(object),
+        "price": rng.random(rows) * 100,
+        "status": rng.choice(STATUSES, rows).astype(object),
+        "created_on": pd.Timestamp("2021-01-01")
+        + pd.to_timedelta(rng.integers(0, 10**6, rows), unit="s"),
+    }
+    if width == "wide":
+        for idx in range(WIDE_COLUMNS):
+            data[f"extra_{idx}"] = rng.integers(0, 100, rows)
+    df = pd.DataFrame(data)
+
+    invalid = {"name": None, "code": -1.5, "price": -1.0, "status": "x"}
+    for name, value in invalid.items():
+        errors = rng.random(rows) < error_rate
+        df[name] = df[name].astype(object)
+        df.loc[errors, name] = value
+    return df
+
+
+def measure(func: typing.Callable, memory: bool) -> typing.Dict[str, float]:
+    """Times func, with memory it is run again under tracemalloc
+    to track its peak memory without slowing down the timing.
+    """
+    start = time.perf_counter()
+    func()
+    result = {"seconds": round(time.perf_counter() - start, 4)}
+    if memory:
+        tracemalloc.start()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        result["peak_mb"] = round(peak / 2**20, 2)
+    return result
+
+
+def run_case(
+    rows: int, width: str, error_rate: float, directory: str, memory: bool
+) -> typing.Dict[str, typing.Dict[str, float]]:
+    spreadsheet_class_ = spreadsheet_class(width)
+    sheet = spreadsheet_class_()
+    path = os.path.join(directory, f"{width}_{rows}.xlsx")
+    if not os.path.exists(path):
+        sheet.export(generate_data(rows, width, error_rate), path)
+
+    results = {"load": measure(lambda: sheet.load(path), memory)}
+
+    def iterate():
+        for row in sheet.rows(validate=False):
+            row["code"].value
+
+    def row_errors():
+        store = RowStore(sheet.df, sheet.fields)
+        for row in RowIterator(sheet.df, sheet.fields, store=store):
+            row.errors
+
+    def validate_columns():
+        sheet.store = RowStore(sheet.df, sheet.fields)
+        sheet.validate()
+
+    def template():
+        spreadsheet_class(width)().template()
+
+    def export_template():
+        sheet.export_template(os.path.join(directory, "template.xlsx"))
+
+    results["rows"] = measure(iterate, memory)
+    results["row_errors"] = measure(row_errors, memory)
+    results["validate"] = measure(validate_columns, memory)
+    results["template"] = measure(template, memory)
+    results["export_template"] = measure(export_template, memory)
+    return results
+
+
+def compare(
+    results: dict, baseline: dict, tolerance: float
+) -> typing.List[str]:
+    """Returns the stages which are slower than the baseline
+    by more than tolerance.
+    """
+    regressions = []
+    for case, stages in results.items():
+        for stage, result in stages.items():
+            expected = baseline.get(case, {}).get(stage)
+            if expected is None:
+                continue
+            limit = expected["seconds"] * (1 + tolerance)
+            if result["seconds"] > limit:
+                regressions.append(
+                    f"{case} {stage}: {result['seconds']}s, "
+                    f"baseline {expected['seconds']}s"
+                )
+    return regressions
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000])
+    parser.add_argument(
+        "--width", nargs="+", choices=["narrow", "wide"], default=["narrow"]
+    )
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument(
+        "--memory", action="store_true", help="track peak memory"
+    )
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for width in args.width:
+            for rows in args.rows:
+                case = f"{width}-{rows}"
+                results[case] = run_case(
+                    rows, width, args.error_rate, directory, args.memory
+                )
+                for stage, result in results[case].items():
+                    peak = result.get("peak_mb")
+                    print(
+                        f"{case:<16} {stage:<16} "
+                        f"{result['seconds']:>10.4f}s"
+                        + (f" {peak:>10.2f}MB" if peak is not None else "")
+                    )
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+    if args.compare:
+        with open(args.baseline) as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"Regression {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import asyncio
+import functools
+import threading
+import typing
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+
+class Limiter:
+    """Lets at most limit jobs run at the same time. The limit can be
+    changed while jobs run, new jobs wait until fewer than the new
+    limit are running.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.running = 0
+        self.condition = threading.Condition()
+
+    def __repr__(self):
+        return f"<Limiter({self.running}/{self.limit})>"
+
+    def set_limit(self, limit: int) -> None:
+        with self.condition:
+            self.limit = limit
+            self.condition.notify_all()
+
+    def __enter__(self):
+        with self.condition:
+            self.condition.wait_for(lambda: self.running < self.limit)
+            self.running += 1
+
+    def __exit__(self, *exc_info):
+        with self.condition:
+            self.running -= 1
+            self.condition.notify()
+
+
+max_workers = 4
+_executor = None
+_lock = threading.Lock()
+_limiter = Limiter(max_workers)
+
+
+def set_concurrency(limit: int) -> None:
+    """Sets the number of loads and validations which run at the
+    same time across all the callers of aload() and arows().
+    Jobs already running count towards the new limit.
+    """
+    global max_workers, _executor
+    with _lock:
+        max_workers = limit
+        _limiter.set_limit(limit)
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers, thread_name_prefix="pycargo"
+            )
+        return _executor
+
+
+def limited(func: typing.Callable, *args, **kwargs) -> typing.Any:
+    with _limiter:
+        return func(*args, **kwargs)
+
+
+async def run(func: typing.Callable, *args, **kwargs) -> typing.Any:
+    """Runs func in the shared executor without blocking the loop.
+    Jobs left on an executor replaced by set_concurrency() share the
+    limit with the new one.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(limited, func, *args, **kwargs)
+    )
+
+
+async def read_source(source: typing.Any) -> typing.Any:
+    """Reads async byte streams, e.g. an upload, into an in-memory
+    buffer. Paths, bytes and file objects are returned as is.
+    """
+    if hasattr(source, "__aiter__"):
+        buffer = BytesIO()
+        async for chunk in source:
+            buffer.write(chunk)
+        buffer.seek(0)
+        return buffer
+    if hasattr(source, "read") and asyncio.iscoroutinefunction(source.read):
+        return BytesIO(await source.read())
+    return source
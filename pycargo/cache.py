@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import threading
+import typing
+
+import pandas as pd
+
+from pycargo import readers
+
+
+class ParseCache:
+    """
+    Cache of loaded dataframes on disk keyed by the hash of the file
+    bytes and the schema fingerprint, so loading the same file again
+    skips parsing. Frames are stored as feather when pyarrow is
+    installed and their columns keep their values, else pickled.
+    Errors of a full validation can be stored along with the frame.
+    Least recently used entries are removed once the directory grows
+    past max_bytes.
+    Only point it to a directory written by this cache, pickles are
+    trusted when read.
+    """
+
+    def __init__(
+        self,
+        directory: typing.Union[str, os.PathLike],
+        max_bytes: int = 1 << 30,
+    ):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __repr__(self):
+        return f"<ParseCache({self.directory!r}, max_bytes={self.max_bytes})>"
+
+    @staticmethod
+    def key(content_hash: str, fingerprint: str, format: str) -> str:
+        data = f"{content_hash}:{fingerprint}:{format}".encode()
+        return hashlib.sha256(data).hexdigest()
+
+    def path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    def touch(self, path: str) -> None:
+        """Marks the entry as recently used."""
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+    def get(self, key: str) -> typing.Optional[pd.DataFrame]:
+        for suffix, read in (
+            (".feather", pd.read_feather),
+            (".pkl", pd.read_pickle),
+        ):
+            path = self.path(key, suffix)
+            try:
+                df = read(path)
+            except FileNotFoundError:
+                continue
+            self.touch(path)
+            return df
+        return None
+
+    def set(self, key: str, df: pd.DataFrame) -> None:
+        df = df.reset_index(drop=True)
+        if not is_feather_safe(df) or not self.write(
+            df.to_feather, self.path(key, ".feather")
+        ):
+            self.write(df.to_pickle, self.path(key, ".pkl"))
+        self.evict()
+
+    def write(self, write: typing.Callable, path: str) -> bool:
+        """Writes to a temporary file first so that readers never see
+        a partial file. Returns False if the frame can not be written.
+        """
+        temp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            write(temp_path)
+        except (TypeError, ValueError):
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            return False
+        os.replace(temp_path, path)
+        return True
+
+    def get_errors(self, key: str) -> typing.Optional[dict]:
+        path = self.path(key, ".errors.json")
+        try:
+            with open(path) as file:
+                errors = json.load(file)
+        except FileNotFoundError:
+            return None
+        self.touch(path)
+        return {int(position): row for position, row in errors.items()}
+
+    def set_errors(self, key: str, errors: dict) -> None:
+        path = self.path(key, ".errors.json")
+        self.write(lambda temp_path: dump_json(errors, temp_path), path)
+        self.evict()
+
+    def size(self) -> int:
+        return sum(entry.stat().st_size for entry in self.entries())
+
+    def entries(self) -> typing.List[os.DirEntry]:
+        return [
+            entry
+            for entry in os.scandir(self.directory)
+            if entry.is_file() and not entry.name.endswith(".tmp")
+        ]
+
+    def evict(self) -> None:
+        """Removes the least recently used files until the cache
+        fits in max_bytes.
+        """
+        with self.lock:
+            entries = sorted(
+                self.entries(), key=lambda entry: entry.stat().st_mtime
+            )
+            size = sum(entry.stat().st_size for entry in entries)
+            for entry in entries:
+                if size <= self.max_bytes:
+                    break
+                size -= entry.stat().st_size
+                try:
+                    os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+
+    def clear(self) -> None:
+        for entry in self.entries():
+            os.unlink(entry.path)
+
+
+def dump_json(data: typing.Any, path: str) -> None:
+    with open(path, "w") as file:
+        json.dump(data, file)
+
+
+def is_feather_safe(df: pd.DataFrame) -> bool:
+    """Whether the frame is read back from feather with the same
+    values. Object columns other than strings, e.g. python ints
+    mixed with None, come back with a different type.
+    """
+    if not readers.has_pyarrow():
+        return False
+    if not all(isinstance(name, str) for name in df.columns):
+        return False
+    for name in df.columns:
+        series = df[name]
+        if series.dtype == object and pd.api.types.infer_dtype(
+            series, skipna=True
+        ) not in ("string", "empty"):
+            return False
+    return True
@@ -0,0 +1,116 @@
+import json
+import os
+import tempfile
+import threading
+import typing
+
+from pycargo import exceptions
+
+
+class Checkpoint(typing.NamedTuple):
+    """
+    Position in a file up to which the rows were processed.
+    A checkpoint only resumes the same file, by the hash of its
+    bytes, loaded by a spreadsheet with the same schema fingerprint.
+    token is the string form to save anywhere and from_token()
+    reads it back.
+    """
+
+    content_hash: str
+    offset: int
+    fingerprint: str
+
+    @property
+    def key(self) -> str:
+        """Same for every checkpoint of the file and the schema."""
+        return f"{self.fingerprint}:{self.content_hash}"
+
+    @property
+    def token(self) -> str:
+        return f"{self.key}:{self.offset}"
+
+    @classmethod
+    def from_token(cls, token: typing.Union[str, bytes]) -> "Checkpoint":
+        if isinstance(token, bytes):
+            token = token.decode()
+        try:
+            fingerprint, content_hash, offset = token.split(":")
+            return cls(content_hash, int(offset), fingerprint)
+        except ValueError:
+            raise exceptions.CheckpointException(
+                f"Invalid checkpoint token '{token}'"
+            )
+
+    def advance(self, offset: int) -> "Checkpoint":
+        return self._replace(offset=offset)
+
+
+class FileStore:
+    """
+    Key-value store in a json file. Every set() rewrites the file
+    atomically so a crash leaves the last saved value.
+    """
+
+    def __init__(self, path: typing.Union[str, os.PathLike]):
+        self.path = os.fspath(path)
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<FileStore({self.path!r})>"
+
+    def read(self) -> typing.Dict[str, str]:
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return {}
+
+    def write(self, data: typing.Dict[str, str]) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def get(self, key: str) -> typing.Optional[str]:
+        return self.read().get(key)
+
+    def set(self, key: str, value: str) -> None:
+        with self.lock:
+            data = self.read()
+            data[key] = value
+            self.write(data)
+
+    def delete(self, key: str) -> None:
+        with self.lock:
+            data = self.read()
+            if data.pop(key, None) is not None:
+                self.write(data)
+
+
+class CheckpointStore:
+    """
+    Saves the checkpoints of files in a key-value client, anything
+    with get(key) and set(key, value) such as a FileStore, a redis
+    client or utils.LRUCache. Checkpoints are keyed by the file and
+    the schema so loading the same file again finds its checkpoint.
+    """
+
+    def __init__(self, client: typing.Any):
+        self.client = client
+
+    def __repr__(self):
+        return f"<CheckpointStore({self.client!r})>"
+
+    def load(self, key: str) -> typing.Optional[Checkpoint]:
+        token = self.client.get(key)
+        if token is None:
+            return None
+        return Checkpoint.from_token(token)
+
+    def save(self, checkpoint: Checkpoint) -> None:
+        self.client.set(checkpoint.key, checkpoint.token)
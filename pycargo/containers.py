@@ -1,13 +1,137 @@
-from typing import Type, Optional, Any, Dict
+import copy
+import pickle
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Type, Optional, Any, Dict, List, Sequence, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
-from pycargo.exceptions import ValidationException
+from pycargo.exceptions import NotValidatedException, ValidationException
 from pycargo.fields import Field
+from pycargo.schema import Schema, as_schema
+from pycargo.stats import Stats
+from pycargo.utils import series_values
+from pycargo.validate import column_errors
 
 
 OptionalField = Optional[Type[Field]]
 FieldsDict = Dict[str, Type[Field]]
+ErrorsDict = Dict[int, Dict[str, List[str]]]
+# Fields are compiled to a Schema when given as a dict
+FieldsOrSchema = Union[FieldsDict, Schema]
+
+
+def cell_errors(
+    value: Any,
+    field: OptionalField,
+    stats: Optional[Stats] = None,
+    name: Optional[str] = None,
+) -> List[str]:
+    """Run the validators of field on the value and return
+    the list of error messages. Validator calls are counted in stats
+    under the field name if given.
+    """
+    if stats is not None:
+        return timed_cell_errors(value, field, stats, name)
+    errors = []
+    for validator in field.validators:
+        try:
+            validator(value)
+        except ValidationException as exc:
+            errors.append(exc.message)
+    return errors
+
+
+def timed_cell_errors(
+    value: Any, field: OptionalField, stats: Stats, name: str
+) -> List[str]:
+    errors = []
+    for validator in field.validators:
+        start = time.perf_counter()
+        try:
+            validator(value)
+            failures = 0
+        except ValidationException as exc:
+            errors.append(exc.message)
+            failures = 1
+        seconds = time.perf_counter() - start
+        stats.count_validator(name, validator, 1, seconds, failures)
+    return errors
+
+
+def merge_errors(errors: ErrorsDict, other: ErrorsDict) -> ErrorsDict:
+    """Add the errors of other to errors, rows are kept sorted."""
+    for position, row_errors in other.items():
+        merged = errors.setdefault(position, {})
+        for name, messages in row_errors.items():
+            merged.setdefault(name, []).extend(messages)
+    return dict(sorted(errors.items()))
+
+
+class DuplicateIndex:
+    """
+    Hash index of the keys of the Unique validators of the fields
+    and of the unique_together groups of the schema. add() returns
+    the errors of the rows whose key was seen before, with the row
+    of the first occurrence in the message. Errors of a group are
+    reported on every field of the group.
+    With remember, keys of every row are kept so that duplicates are
+    found across the frames of a stream, otherwise only the repeated
+    keys of a single frame are indexed.
+    """
+
+    def __init__(
+        self,
+        fields: FieldsOrSchema,
+        remember: bool = False,
+    ):
+        self.checks = as_schema(fields).checks
+        self.remember = remember
+        self.seen = [{} for _ in self.checks]
+        self.offset = 0
+
+    def __repr__(self):
+        return f"<DuplicateIndex({[names for names, _ in self.checks]})>"
+
+    def __bool__(self) -> bool:
+        return bool(self.checks)
+
+    def duplicates(
+        self, check: int, keys: Type[pd.DataFrame]
+    ) -> List[Tuple[int, int]]:
+        """Returns the position and the first row of every
+        duplicate key.
+        """
+        keys = keys[keys.notna().all(axis=1).to_numpy()]
+        if not self.remember:
+            keys = keys[keys.duplicated(keep=False).to_numpy()]
+        seen = self.seen[check]
+        duplicates = []
+        rows = keys.itertuples(index=False, name=None)
+        for position, key in zip(keys.index, rows):
+            row = self.offset + position
+            first = seen.setdefault(key, row)
+            if first != row:
+                duplicates.append((position, first))
+        return duplicates
+
+    def add(self, df: Type[pd.DataFrame]) -> ErrorsDict:
+        errors = {}
+        for check, (names, validator) in enumerate(self.checks):
+            keys = pd.concat(
+                [get_column(df, name) for name in names], axis=1
+            ).reset_index(drop=True)
+            for position, first in self.duplicates(check, keys):
+                row_errors = errors.setdefault(position, {})
+                message = validator._format_error(first)
+                for name in names:
+                    row_errors.setdefault(name, []).append(message)
+        if self.remember:
+            self.offset += len(df)
+        return dict(sorted(errors.items()))
 
 
 class Cell:
@@ -15,24 +139,36 @@ class Cell:
     This represents as a cell in excel.
     Errors occured when validating do not raise exceptions,
     the are added to errors list.
+    Cell is validated lazily on first access of errors and the
+    result is cached. With validate=False the cell is trusted and
+    never validated.
     """
 
-    def __init__(self, value: Any, field_type: OptionalField):
+    __slots__ = ("value", "type", "_errors")
+
+    def __init__(
+        self, value: Any, field_type: OptionalField, validate: bool = True
+    ):
         self.value = value
         self.type = field_type
-        self.errors = []
-        self.validate()
+        self._errors = None if validate else []
 
     def __repr__(self):
         value = None if pd.isna(self.value) else self.value
         return f"<Cell {value}>"
 
+    @property
+    def errors(self) -> List[str]:
+        if self._errors is None:
+            self.validate()
+        return self._errors
+
+    @errors.setter
+    def errors(self, errors: List[str]):
+        self._errors = errors
+
     def validate(self):
-        for validator in self.type.validators:
-            try:
-                validator(self.value)
-            except ValidationException as exc:
-                self.errors.append(exc.message)
+        self._errors = cell_errors(self.value, self.type)
 
 
 class Row:
@@ -41,6 +177,8 @@ class Row:
     Consists one or more cells.
     """
 
+    __slots__ = ("cells",)
+
     def __init__(self, cells):
         self.cells = cells
 
@@ -67,30 +205,475 @@ class Row:
         return data
 
 
-def get_row_obj(row_data: dict, fields: FieldsDict) -> Type[Row]:
+class RowStore:
+    """
+    Columnar storage of the loaded rows. Values are kept in
+    the columns of the dataframe and are extracted once per column
+    when first accessed. Errors are kept sparsely, only rows with
+    errors have an entry of (field id, message id) pairs and every
+    distinct message is stored once. invalid flags the rows with
+    errors for selecting them in bulk.
+    Rows are validated lazily one at a time or all at once
+    a column at a time with validate_all().
+    With max_errors, validation stops once that many errors are found
+    and the rows after it are left unvalidated, asking for their errors
+    raises NotValidatedException.
+    With stats, extraction of the columns and validator calls are
+    measured.
+    Unique validators and unique_together groups of the schema are
+    checked over all the rows when the first row is validated, unless
+    duplicates are given, e.g. by the DuplicateIndex of a stream.
+    """
+
+    budget_chunk_size = 1000
+
+    def __init__(
+        self,
+        df: Type[pd.DataFrame],
+        fields: FieldsOrSchema,
+        validate: bool = True,
+        max_errors: Optional[int] = None,
+        stats: Optional[Stats] = None,
+        duplicates: Optional[ErrorsDict] = None,
+    ):
+        self.df = df
+        self.schema = as_schema(fields)
+        self.fields = self.schema.fields
+        self.total_rows = len(df)
+        self.field_names = list(self.fields)
+        self.field_ids = {name: idx for idx, name in enumerate(self.fields)}
+        self.columns = {}
+        self.messages = []
+        self.message_ids = {}
+        self.errors = {}
+        self.validated = np.full(self.total_rows, not validate)
+        self.invalid = np.zeros(self.total_rows, dtype=bool)
+        self.max_errors = max_errors
+        self.error_count = 0
+        self.exhausted = False
+        self.stats = stats
+        self.duplicates = duplicates
+
+    def __repr__(self):
+        return f"<RowStore({self.total_rows})>"
+
+    def __len__(self) -> int:
+        return self.total_rows
+
+    def column(self, name: str) -> Optional[np.ndarray]:
+        """Values of the column as cells see them, None for
+        fields not present in the dataframe.
+        """
+        if name not in self.columns:
+            if self.stats is None or name not in self.df:
+                self.columns[name] = (
+                    series_values(self.df[name]) if name in self.df else None
+                )
+            else:
+                with self.stats.stage("materialize"):
+                    self.columns[name] = series_values(self.df[name])
+        return self.columns[name]
+
+    def value(self, position: int, name: str) -> Any:
+        column = self.column(name)
+        return None if column is None else column[position]
+
+    def add_error(self, position: int, name: str, message: str):
+        message_id = self.message_ids.get(message)
+        if message_id is None:
+            message_id = self.message_ids[message] = len(self.messages)
+            self.messages.append(message)
+        row_errors = self.errors.setdefault(position, [])
+        row_errors.append((self.field_ids[name], message_id))
+        self.invalid[position] = True
+        self.error_count += 1
+
+    def mark_validated(self, position: int):
+        self.validated[position] = True
+        if self.max_errors is not None:
+            self.exhausted = self.error_count >= self.max_errors
+
+    def get_duplicates(self) -> ErrorsDict:
+        if self.duplicates is None:
+            index = DuplicateIndex(self.schema)
+            self.duplicates = index.add(self.df) if index else {}
+        return self.duplicates
+
+    def validate_row(self, position: int):
+        if self.exhausted:
+            return
+        for name, field in self.fields.items():
+            value = self.value(position, name)
+            for message in cell_errors(value, field, self.stats, name):
+                self.add_error(position, name, message)
+        for name, messages in self.get_duplicates().get(position, {}).items():
+            for message in messages:
+                self.add_error(position, name, message)
+        self.mark_validated(position)
+
+    def validate_all(self, workers: Optional[int] = None):
+        """Validate all the rows not validated yet a column at a time.
+        With workers the rows are validated on a pool of processes.
+        """
+        self.validate_rows(range(self.total_rows), workers)
+
+    def validate_rows(
+        self,
+        positions: Sequence[int],
+        workers: Optional[int] = None,
+        executor: Optional[ProcessPoolExecutor] = None,
+    ):
+        """Validate the rows at positions a column at a time,
+        rows validated earlier are skipped. With an error budget the
+        rows are validated in chunks so that validation stops soon
+        after the budget is exhausted.
+        With workers the rows are validated on executor, a pool from
+        worker_pool() for the schema of the store, else on a pool
+        created for this call.
+        """
+        pending = np.zeros(self.total_rows, dtype=bool)
+        pending[positions] = True
+        pending &= ~self.validated
+        positions = np.flatnonzero(pending)
+        chunk_size = len(positions) or 1
+        if self.max_errors is not None:
+            chunk_size = self.budget_chunk_size
+        owned = None
+        if executor is None and workers and workers > 1 and len(positions):
+            # One pool for all the chunks
+            owned = executor = worker_pool(self.schema, workers)
+        with owned or nullcontext():
+            for start in range(0, len(positions), chunk_size):
+                if self.exhausted:
+                    return
+                chunk = positions[start : start + chunk_size]
+                df = self.df
+                if len(chunk) < self.total_rows:
+                    df = self.df.iloc[chunk]
+                if executor is not None:
+                    errors = validate_frame_parallel(
+                        df, self.schema, workers, False, executor
+                    )
+                else:
+                    errors = validate_frame(
+                        df, self.schema, self.stats, cross_row=False
+                    )
+                duplicates = self.get_duplicates()
+                if duplicates:
+                    errors = merge_errors(
+                        errors,
+                        {
+                            idx: duplicates[position]
+                            for idx, position in enumerate(chunk)
+                            if position in duplicates
+                        },
+                    )
+                self.add_frame_errors(chunk, errors)
+
+    def add_frame_errors(self, positions: np.ndarray, errors: ErrorsDict):
+        """Record errors of validate_frame for the rows at positions.
+        Stops at the row which exhausts the error budget.
+        """
+        if self.max_errors is None:
+            for position, row_errors in errors.items():
+                for name, messages in row_errors.items():
+                    for message in messages:
+                        self.add_error(int(positions[position]), name, message)
+            self.validated[positions] = True
+            return
+
+        for idx, position in enumerate(positions):
+            for name, messages in errors.get(idx, {}).items():
+                for message in messages:
+                    self.add_error(int(position), name, message)
+            self.mark_validated(position)
+            if self.exhausted:
+                return
+
+    def row_errors(self, position: int) -> Dict[str, List[str]]:
+        """Errors of the row, validated first if needed. Raises
+        NotValidatedException if the row was not validated before the
+        error budget was exhausted, its errors are unknown.
+        """
+        if not self.validated[position]:
+            self.validate_row(position)
+            if not self.validated[position]:
+                raise NotValidatedException(
+                    f"Row {position} was not validated, "
+                    "the error budget is exhausted"
+                )
+        errors = {}
+        for field_id, message_id in self.errors.get(position, ()):
+            name = self.field_names[field_id]
+            errors.setdefault(name, []).append(self.messages[message_id])
+        return errors
+
+    def cell_errors(self, position: int, name: str) -> List[str]:
+        return self.row_errors(position).get(name, [])
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts of the validation done so far."""
+        return {
+            "validated_rows": int(self.validated.sum()),
+            "invalid_rows": len(self.errors),
+            "errors": self.error_count,
+            "exhausted": self.exhausted,
+        }
+
+    def all_errors(self, workers: Optional[int] = None) -> ErrorsDict:
+        """Errors of all the invalid rows keyed by row position.
+        Errors are partial if the error budget is exhausted.
+        """
+        self.validate_all(workers)
+        return {
+            position: self.row_errors(position)
+            for position in sorted(self.errors)
+        }
+
+
+class CellView(Cell):
+    """Cell backed by a RowStore, created when a row is indexed."""
+
+    __slots__ = ("_store", "_position", "_name")
+
+    def __init__(self, store: RowStore, position: int, name: str):
+        self._store = store
+        self._position = position
+        self._name = name
+        self.value = store.value(position, name)
+        self.type = store.fields[name]
+
+    @property
+    def errors(self) -> List[str]:
+        return self._store.cell_errors(self._position, self._name)
+
+
+class RowView(Row):
+    """Row backed by a RowStore. Values and errors are read from
+    the store, cells are only created when the row is indexed.
+    """
+
+    __slots__ = ("_store", "_position")
+
+    def __init__(self, store: RowStore, position: int):
+        self._store = store
+        self._position = position
+
+    @property
+    def cells(self) -> Dict[str, CellView]:
+        return {name: self[name] for name in self._store.fields}
+
+    def __getitem__(self, key):
+        if key not in self._store.fields:
+            raise KeyError(key)
+        return CellView(self._store, self._position, key)
+
+    @property
+    def errors(self) -> dict:
+        return self._store.row_errors(self._position)
+
+    @property
+    def validated(self) -> bool:
+        return bool(self._store.validated[self._position])
+
+    def as_dict(self):
+        data = {"errors": self.errors}
+        for field_name in self._store.fields:
+            data[field_name] = self._store.value(self._position, field_name)
+        return data
+
+
+def get_column(df: Type[pd.DataFrame], name: str) -> Type[pd.Series]:
+    """Returns the column of the dataframe. Fields which are not
+    present in the dataframe get a column of None values, the same
+    value a Cell gets for them.
+    """
+    if name in df:
+        return df[name]
+    return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+
+def validate_frame(
+    df: Type[pd.DataFrame],
+    fields: FieldsOrSchema,
+    stats: Optional[Stats] = None,
+    cross_row: bool = True,
+) -> ErrorsDict:
+    """Validate the dataframe a column at a time. Every validator
+    is run once per column with its column form, validators without
+    a column form are run cell by cell.
+    Returns the errors of invalid rows keyed by the row position, in
+    the same format as Row.errors. Validators are counted once per
+    cell in stats if given.
+    Duplicates of Unique validators and unique_together groups are
+    added after the errors of the other validators, pass
+    cross_row=False to skip them for a chunk of rows.
+    """
+    schema = as_schema(fields)
+    errors = {}
+    for name, plan in schema.plans.items():
+        series = get_column(df, name)
+        for validator, column in plan:
+            if stats is not None:
+                start = time.perf_counter()
+            if column is None:
+                mask, messages = column_errors(validator, series)
+            else:
+                mask, messages = column(series)
+            if stats is not None:
+                seconds = time.perf_counter() - start
+                stats.count_validator(
+                    name, validator, len(series), seconds, len(messages)
+                )
+            for position, message in zip(np.flatnonzero(mask), messages):
+                row_errors = errors.setdefault(int(position), {})
+                row_errors.setdefault(name, []).append(message)
+    if cross_row and schema.checks:
+        return merge_errors(errors, DuplicateIndex(schema).add(df))
+    return dict(sorted(errors.items()))
+
+
+_worker_fields = None
+
+
+def _init_worker(fields: bytes):
+    global _worker_fields
+    _worker_fields = pickle.loads(fields)
+
+
+def _validate_chunk(df: Type[pd.DataFrame]) -> ErrorsDict:
+    return validate_frame(df, _worker_fields, cross_row=False)
+
+
+def worker_pool(
+    fields: FieldsOrSchema, workers: int
+) -> Optional[ProcessPoolExecutor]:
+    """Pool of worker processes for validate_frame_parallel, the fields
+    are sent to each worker once. Returns None with a warning if the
+    fields can not be pickled, e.g. lambdas as validators.
+    """
+    try:
+        payload = pickle.dumps(as_schema(fields))
+    except (pickle.PicklingError, AttributeError, TypeError) as exc:
+        warnings.warn(
+            f"Validating serially, fields can not be pickled: {exc}",
+            RuntimeWarning,
+        )
+        return None
+    return ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(payload,)
+    )
+
+
+def validate_frame_parallel(
+    df: Type[pd.DataFrame],
+    fields: FieldsOrSchema,
+    workers: int,
+    cross_row: bool = True,
+    executor: Optional[ProcessPoolExecutor] = None,
+) -> ErrorsDict:
+    """Validate the dataframe in row chunks on a pool of worker
+    processes and merge the errors back in row order, same as
+    validate_frame. Duplicates are found in this process over all
+    the rows.
+    Pass an executor from worker_pool() with the same fields to reuse
+    it across calls, else a pool is created for this call. Falls back
+    to validating in this process if the fields can not be pickled.
+    """
+    schema = as_schema(fields)
+    if executor is None:
+        executor = worker_pool(schema, workers)
+        if executor is None:
+            return validate_frame(df, schema, cross_row=cross_row)
+        with executor:
+            return validate_frame_parallel(
+                df, schema, workers, cross_row, executor
+            )
+
+    bounds = np.linspace(0, len(df), workers + 1, dtype=int).tolist()
+    spans = [
+        (start, stop)
+        for start, stop in zip(bounds[:-1], bounds[1:])
+        if stop > start
+    ]
+    starts = [start for start, _ in spans]
+    chunks = [df.iloc[start:stop] for start, stop in spans]
+    errors = {}
+    results = executor.map(_validate_chunk, chunks)
+    for start, chunk_errors in zip(starts, results):
+        for position, row_errors in chunk_errors.items():
+            errors[start + position] = row_errors
+    if cross_row and schema.checks:
+        return merge_errors(errors, DuplicateIndex(schema).add(df))
+    return errors
+
+
+def get_row_obj(
+    row_data: dict, fields: FieldsDict, validate: bool = True
+) -> Type[Row]:
     cells = {}
     for key in fields:
-        cells[key] = Cell(row_data.get(key), fields[key])
+        cells[key] = Cell(row_data.get(key), fields[key], validate)
     return Row(cells)
 
 
 class RowIterator:
-    def __init__(self, df: Type[pd.DataFrame], fields: dict):
+    """
+    Iterates over the rows of a RowStore. Rows are views
+    over the store created when accessed. Supports len(), indexing
+    and slicing.
+    Cells are validated when their errors are accessed, pass
+    validate=False to skip validation of trusted data.
+    Once the error budget of the store is exhausted, iteration stops
+    at the first row which was not validated.
+    """
+
+    def __init__(
+        self,
+        df: Type[pd.DataFrame],
+        fields: FieldsOrSchema,
+        validate: bool = True,
+        store: Optional[RowStore] = None,
+    ):
         self.df = df
-        self.fields = fields
-        self.total_rows = len(df)
+        self.store = store or RowStore(df, fields, validate)
+        self.fields = self.store.fields
+        self.positions = range(len(df))
+        self.total_rows = len(self.positions)
+        self.row = 0
 
     def __repr__(self):
         return f"<RowIterator({self.total_rows})>"
 
+    def __len__(self) -> int:
+        return self.total_rows
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            rows = copy.copy(self)
+            rows.positions = self.positions[key]
+            rows.total_rows = len(rows.positions)
+            rows.df = self.df.iloc[key]
+            return rows
+        try:
+            return RowView(self.store, self.positions[key])
+        except IndexError:
+            raise IndexError("Row index out of range")
+
     def __iter__(self):
         self.row = 0
         return self
 
+    @property
+    def offset(self) -> int:
+        """Position of the next row to be returned by iteration."""
+        return self.positions.start + self.row * self.positions.step
+
     def __next__(self) -> Type[Row]:
-        if self.row < self.total_rows:
-            result = dict(self.df.iloc[self.row])
-            self.row += 1
-            return get_row_obj(result, self.fields)
-        else:
+        if self.row >= self.total_rows:
+            raise StopIteration
+        position = self.positions[self.row]
+        if self.store.exhausted and not self.store.validated[position]:
             raise StopIteration
+        self.row += 1
+        return RowView(self.store, position)
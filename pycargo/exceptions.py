@@ -8,6 +8,22 @@ class InvalidHeaderException(PyCargoException):
     pass
 
 
+class LimitExceededException(PyCargoException):
+    pass
+
+
 class ValidationException(PyCargoException):
     def __init__(self, message: str):
         self.message = message
+
+
+class InvalidSheetException(PyCargoException):
+    pass
+
+
+class CheckpointException(PyCargoException):
+    pass
+
+
+class NotValidatedException(PyCargoException):
+    pass
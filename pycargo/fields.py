@@ -5,6 +5,7 @@ import pandas as pd
 import numpy as np
 
 from pycargo.exceptions import ValidationException
+from pycargo.validate import ColumnErrors, column_errors
 
 
 # Types
@@ -19,18 +20,24 @@ class Field:
     attributes and methods for validation.
     data_key is the external representation of the Field which
     is used at the time of export and import.
+    dtype is the pandas dtype the column is stored in after loading,
+    None keeps the dtype given by the reader.
     """
 
     _creation_index = 0  # For sorting
+    dtype = None
 
     def __init__(
         self,
         validate: FuncOrFuncList = None,
         comment: Optional[str] = None,
         data_key: Optional[str] = None,
+        dtype: Optional[str] = None,
     ):
         self.comment = comment
         self.data_key = data_key
+        if dtype is not None:
+            self.dtype = dtype
         self.validators = []
         self._register_validators(validate)
         self._creation_index = Field._creation_index
@@ -63,6 +70,33 @@ class Field:
         """
         raise NotImplementedError
 
+    def _type_mask(self, series: pd.Series) -> Optional[np.ndarray]:
+        """Vectorized counterpart of validate_type to be overriden
+        by other fields. Returns a mask of values that may be invalid,
+        None means every value is checked with validate_type.
+        """
+        return None
+
+    def validate_type_column(self, series: pd.Series) -> ColumnErrors:
+        """Column form of validate_type. Returns a boolean error
+        mask of the column and the error messages.
+        """
+        return column_errors(
+            self.validate_type, series, self._type_mask(series)
+        )
+
+    def column_validators(self) -> List[Optional[Callable]]:
+        """Method to return the column forms of self.validators
+        in the same order. None is returned for validators without
+        a column form, these are run cell by cell.
+        """
+        return [
+            self.validate_type_column
+            if validator == self.validate_type
+            else getattr(validator, "column", None)
+            for validator in self.validators
+        ]
+
     def validate(self, value: Any) -> List:
         """Method to check value against
         the validators and return list of errors
@@ -76,18 +110,36 @@ class Field:
 
 
 class IntegerField(Field):
+    dtype = "Int64"
+
     def validate_type(self, value: Any) -> OptionalString:
-        if not isinstance(value, np.int64):
+        if not isinstance(value, (int, np.integer)) or isinstance(
+            value, (bool, np.bool_)
+        ):
             raise ValidationException("Value must be integer")
 
+    def _type_mask(self, series: pd.Series) -> Optional[np.ndarray]:
+        if pd.api.types.is_integer_dtype(series.dtype):
+            return series.isna().to_numpy()
+        return None
+
 
 class DateTimeField(Field):
+    dtype = "datetime64[ns]"
+
     def validate_type(self, value: Any):
         if not isinstance(value, pd.Timestamp):
             raise ValidationException(f"{value} not a valid datetime")
 
+    def _type_mask(self, series: pd.Series) -> Optional[np.ndarray]:
+        if series.dtype.kind == "M":
+            return series.isna().to_numpy()
+        return None
+
 
 class DateField(Field):
+    dtype = "datetime64[ns]"
+
     def validate_type(self, value: Any):
         if not isinstance(value, pd.Timestamp):
             raise ValidationException(f"{value} not a valid date")
@@ -98,26 +150,60 @@ class DateField(Field):
                     f"{value} is a datetiem and not date."
                 )
 
+    def _type_mask(self, series: pd.Series) -> Optional[np.ndarray]:
+        if series.dtype.kind == "M":
+            return (
+                series.isna() | (series != series.dt.normalize())
+            ).to_numpy()
+        return None
+
 
 class StringField(Field):
+    dtype = "string"
+
     def validate_type(self, value: Any) -> OptionalString:
         if not isinstance(value, str):
             raise ValidationException("Value must be string")
 
+    def _type_mask(self, series: pd.Series) -> Optional[np.ndarray]:
+        # Subclasses checking more than the type, e.g. EmailField,
+        # validate every string
+        if type(self).validate_type is not StringField.validate_type:
+            return None
+        if pd.api.types.infer_dtype(series, skipna=False) == "string":
+            return series.isna().to_numpy()
+        return None
+
 
 class FloatField(Field):
+    dtype = "float64"
+
     def validate_type(self, value: Any) -> OptionalString:
         if not isinstance(value, float):
             raise ValidationException("Value must be float")
 
+    def _type_mask(self, series: pd.Series) -> Optional[np.ndarray]:
+        if series.dtype == np.float64:
+            return np.zeros(len(series), dtype=bool)
+        return None
+
 
 class BooleanField(Field):
+    dtype = "boolean"
+
     def validate_type(self, value: Any) -> OptionalString:
         if isinstance(value, str):
             value = value.lower()
         if value not in ("true", "1", 1, "false", "0", 0):
             raise ValidationException(f"{value} is not a valid boolean value")
 
+    def _type_mask(self, series: pd.Series) -> Optional[np.ndarray]:
+        if series.dtype.kind == "b":
+            return series.isna().to_numpy()
+        if series.dtype.kind in "iu":
+            return (~series.isin([0, 1])).to_numpy()
+        return None
+
 
 class DomainField(StringField):
     def validate_type(self, value: Any) -> OptionalString:
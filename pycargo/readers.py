@@ -0,0 +1,510 @@
+import hashlib
+import importlib.util
+import io
+import mmap
+import os
+import typing
+import zipfile
+from contextlib import contextmanager
+from itertools import chain, islice
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+from pycargo import exceptions
+
+
+Source = typing.Union[str, os.PathLike, typing.BinaryIO]
+Buffer = typing.Union[bytes, bytearray, memoryview]
+
+EXTENSIONS = {
+    ".xlsx": "excel",
+    ".xlsm": "excel",
+    ".xls": "excel",
+    ".csv": "csv",
+    ".txt": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+MAGIC_BYTES = [
+    (b"PK\x03\x04", "excel"),
+    (b"\xd0\xcf\x11\xe0", "excel"),
+    (b"PAR1", "parquet"),
+    (b"ARROW1", "arrow"),
+]
+# Text read as missing values by the C engine of read_csv
+NA_VALUES = frozenset(
+    [
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "n/a",
+        "nan",
+        "null",
+    ]
+)
+
+
+def has_pyarrow() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def pandas_version() -> typing.Tuple[int, int]:
+    major, minor = pd.__version__.split(".")[:2]
+    return int(major), int(minor)
+
+
+def csv_engine() -> str:
+    """pyarrow if it is installed and pandas supports it as the
+    engine of read_csv, since pandas 1.4, else the C engine.
+    """
+    if has_pyarrow() and pandas_version() >= (1, 4):
+        return "pyarrow"
+    return "c"
+
+
+def read_csv(source: Source, **options) -> pd.DataFrame:
+    """Reads csv with the pyarrow engine when it is installed,
+    else with the C engine.
+    """
+    if csv_engine() == "c":
+        return pd.read_csv(source, engine="c", **options)
+    df = pd.read_csv(source, engine="pyarrow", **options)
+    return null_text(df)
+
+
+def null_text(df: pd.DataFrame) -> pd.DataFrame:
+    """Pyarrow reads blank cells and the NA_VALUES of text columns as
+    text, replaces them with missing values as the C engine does.
+    """
+    for name in df.columns:
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            nulls = [
+                value for value in series.cat.categories if value in NA_VALUES
+            ]
+            if nulls:
+                df[name] = series.cat.remove_categories(nulls)
+        elif series.dtype == object or pd.api.types.is_string_dtype(
+            series.dtype
+        ):
+            mask = series.isin(NA_VALUES)
+            if mask.any():
+                df[name] = series.mask(mask)
+    return df
+
+
+def read_parquet(source: Source, usecols=None) -> pd.DataFrame:
+    return pd.read_parquet(source, columns=usecols)
+
+
+def read_arrow(source: Source, usecols=None) -> pd.DataFrame:
+    return pd.read_feather(source, columns=usecols)
+
+
+def read_options(
+    format: str, columns: typing.Optional[typing.Dict[str, typing.Any]]
+) -> typing.Dict[str, typing.Any]:
+    """Reader arguments derived from the fields of the columns present
+    in the file, keyed by their headers. Only these columns are read.
+    Csv is text so string and datetime columns are also converted
+    by the reader, other formats keep the types stored in the file.
+    """
+    if columns is None:
+        return {}
+    options = {"usecols": list(columns)}
+    if format == "csv":
+        options["dtype"] = {
+            header: field.dtype
+            for header, field in columns.items()
+            if field.dtype in ("string", "category")
+        }
+        options["parse_dates"] = [
+            header
+            for header, field in columns.items()
+            if str(field.dtype).startswith("datetime64")
+        ]
+    return options
+
+
+def coerce_column(series: pd.Series, dtype: typing.Any) -> pd.Series:
+    """Casts the column to the declared dtype when every value can be
+    kept as is, e.g. floats holding integers and NaN to nullable
+    Int64. Otherwise the column is returned unchanged and its values
+    are reported by validation. Integers are cast to float64 only
+    when they are exactly representable.
+    """
+    if dtype is None or series.dtype == dtype:
+        return series
+    inferred = pd.api.types.infer_dtype(series, skipna=True)
+    if dtype == "Int64":
+        if inferred == "integer":
+            return (
+                series if series.dtype.kind in "iu" else series.astype(dtype)
+            )
+        if inferred == "floating" and series.dtype.kind == "f":
+            values = series.dropna().to_numpy()
+            if (np.abs(values) < 2**53).all() and (
+                values == np.floor(values)
+            ).all():
+                return series.astype(dtype)
+    elif dtype == "float64":
+        if inferred in ("integer", "mixed-integer-float"):
+            values = series.dropna().to_numpy()
+            if (np.abs(values) < 2**53).all():
+                return series.astype(dtype)
+    elif dtype == "boolean":
+        if inferred == "boolean":
+            return series.astype(dtype)
+    elif dtype in ("string", "category"):
+        if inferred in ("string", "empty"):
+            return series.astype(dtype)
+    elif str(dtype).startswith("datetime64"):
+        if inferred in ("datetime", "datetime64"):
+            return pd.to_datetime(series)
+    return series
+
+
+def coerce_frame(
+    df: pd.DataFrame, fields: typing.Dict[str, typing.Any]
+) -> pd.DataFrame:
+    """Casts the columns of the fields to their declared dtypes."""
+    columns = {}
+    for name, field in fields.items():
+        if name in df:
+            series = coerce_column(df[name], field.dtype)
+            if series is not df[name]:
+                columns[name] = series
+    return df.assign(**columns) if columns else df
+
+
+class Preflight(typing.NamedTuple):
+    """Headers and size of a file read without parsing its rows.
+    Counts are None when the format does not store them.
+    """
+
+    headers: typing.List[str]
+    rows: typing.Optional[int]
+    columns: int
+
+
+def is_ooxml(source: Source) -> bool:
+    """Whether the file is an xlsx or xlsm workbook which openpyxl
+    reads, unlike xls, xlsb and ods files.
+    """
+    try:
+        with zipfile.ZipFile(source) as archive:
+            return "xl/workbook.xml" in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+def excel_preflight(source: Source) -> typing.Optional[Preflight]:
+    """Reads only the first row and the dimension of the first sheet
+    in read-only mode, this takes the same time for any file size.
+    Returns None for workbooks openpyxl can not read.
+    """
+    if not is_ooxml(source):
+        return None
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        # The sheet read by pandas, not the one selected when saved
+        sheet = workbook.worksheets[0]
+        first_row = next(sheet.iter_rows(max_row=1, values_only=True), ())
+        headers = get_headers(first_row)
+        rows = None if sheet.max_row is None else max(sheet.max_row - 1, 0)
+        return Preflight(headers, rows, len(headers))
+    finally:
+        workbook.close()
+
+
+def csv_preflight(source: Source) -> Preflight:
+    headers = list(pd.read_csv(source, nrows=0).columns)
+    return Preflight(headers, None, len(headers))
+
+
+def parquet_preflight(source: Source) -> Preflight:
+    from pyarrow import parquet
+
+    metadata = parquet.ParquetFile(source).metadata
+    headers = list(metadata.schema.to_arrow_schema().names)
+    return Preflight(headers, metadata.num_rows, len(headers))
+
+
+PREFLIGHTS = {
+    "excel": excel_preflight,
+    "csv": csv_preflight,
+    "parquet": parquet_preflight,
+}
+
+
+def preflight(
+    source: Source, format: typing.Optional[str] = None
+) -> typing.Optional[Preflight]:
+    """Reads the headers and size of the file without parsing it.
+    Returns None for formats without a preflight reader. File objects
+    are rewound to their position after reading.
+    """
+    format = format or detect_format(source)
+    if format not in PREFLIGHTS:
+        return None
+    if not hasattr(source, "read"):
+        return PREFLIGHTS[format](source)
+    position = source.tell()
+    try:
+        return PREFLIGHTS[format](source)
+    finally:
+        source.seek(position)
+
+
+READERS = {
+    "excel": pd.read_excel,
+    "csv": read_csv,
+    "parquet": read_parquet,
+    "arrow": read_arrow,
+}
+
+
+class MemoryReader(io.RawIOBase):
+    """
+    Read-only binary file over a buffer such as bytes or a memory
+    mapped file. The buffer is not copied, read() only copies the
+    bytes it returns.
+    """
+
+    def __init__(self, buffer: Buffer):
+        self.buffer = memoryview(buffer).cast("B")
+        self.position = 0
+
+    def __repr__(self):
+        return f"<MemoryReader({len(self.buffer)})>"
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        self._checkClosed()
+        end = len(self.buffer)
+        if size is not None and size >= 0:
+            end = min(self.position + size, end)
+        data = self.buffer[self.position : end].tobytes()
+        self.position = max(self.position, end)
+        return data
+
+    def readall(self) -> bytes:
+        return self.read()
+
+    def readinto(self, buffer: typing.Any) -> int:
+        data = self.buffer[self.position : self.position + len(buffer)]
+        size = len(data)
+        memoryview(buffer).cast("B")[:size] = data
+        self.position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += len(self.buffer)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self.position = offset
+        return offset
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self.position
+
+    def getbuffer(self) -> memoryview:
+        """View of the whole buffer, as BytesIO.getbuffer()."""
+        return self.buffer[:]
+
+    def close(self) -> None:
+        if not self.closed:
+            self.buffer.release()
+        super().close()
+
+
+@contextmanager
+def open_source(
+    source: typing.Union[Source, Buffer]
+) -> typing.Iterator[typing.BinaryIO]:
+    """Opens the source as a binary file object without copying it.
+    Buffers are read in place and files are memory mapped, file
+    objects are returned as is. Empty files can not be mapped and
+    are opened normally.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        with MemoryReader(source) as reader:
+            yield reader
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as file:
+            try:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                yield file
+                return
+            with mapped, MemoryReader(mapped) as reader:
+                yield reader
+    else:
+        yield source
+
+
+def content_hash(
+    source: typing.Union[Source, Buffer], block_size: int = 1 << 20
+) -> str:
+    """Returns the sha256 hex digest of the bytes of the file.
+    File objects are rewound to their position after reading.
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif hasattr(source, "getbuffer"):
+        with source.getbuffer() as buffer:
+            digest.update(buffer[source.tell() :])
+    elif hasattr(source, "read"):
+        position = source.tell()
+        for block in iter(lambda: source.read(block_size), b""):
+            digest.update(block)
+        source.seek(position)
+    else:
+        with open(source, "rb") as file:
+            for block in iter(lambda: file.read(block_size), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def read_magic_bytes(
+    source: typing.Union[Source, Buffer], size: int = 8
+) -> bytes:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source[:size])
+    if hasattr(source, "read"):
+        position = source.tell()
+        header = source.read(size)
+        source.seek(position)
+        return header
+    with open(source, "rb") as file:
+        return file.read(size)
+
+
+def detect_format(source: typing.Union[Source, Buffer]) -> str:
+    """Detects the format of the file from the extension of its path
+    or else from its first bytes. Falls back to csv.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        extension = os.path.splitext(os.fspath(source))[1].lower()
+        if extension in EXTENSIONS:
+            return EXTENSIONS[extension]
+    header = read_magic_bytes(source)
+    for magic, format in MAGIC_BYTES:
+        if header.startswith(magic):
+            return format
+    return "csv"
+
+
+def read_frame(
+    source: Source,
+    format: typing.Optional[str] = None,
+    columns: typing.Optional[typing.Dict[str, typing.Any]] = None,
+) -> pd.DataFrame:
+    """Reads the file into a dataframe with the reader of its format.
+    Format is detected when not given. columns maps the headers to be
+    read to their fields, see read_options().
+    """
+    format = format or detect_format(source)
+    if format not in READERS:
+        raise exceptions.PyCargoException(
+            f"Unsupported format '{format}', "
+            f"expected one of {', '.join(READERS)}"
+        )
+    return READERS[format](source, **read_options(format, columns))
+
+
+def excel_rows(path: str, skip: int = 0) -> typing.Iterator[tuple]:
+    """Generator over the values of the rows of first sheet in the
+    excel file. Workbook is opened in read-only mode so rows are
+    parsed as they are consumed and not held in memory.
+    Trailing empty rows are skipped, the same as pandas does.
+    skip rows after the header are passed over without reading
+    their cells.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        # The sheet read by pandas, not the one selected when saved
+        sheet = workbook.worksheets[0]
+        rows = sheet.iter_rows(max_row=1, values_only=True)
+        if skip:
+            rows = chain(
+                rows, sheet.iter_rows(min_row=skip + 2, values_only=True)
+            )
+        else:
+            rows = sheet.iter_rows(values_only=True)
+        blank_rows = 0
+        for row in rows:
+            if all(value is None for value in row):
+                blank_rows += 1
+                continue
+            for _ in range(blank_rows):
+                yield (None,) * len(row)
+            blank_rows = 0
+            yield row
+    finally:
+        workbook.close()
+
+
+def get_headers(row: tuple) -> typing.List[str]:
+    """Returns the headers from the first row of the sheet.
+    Empty headers are named the way pandas names them, trailing empty
+    cells, e.g. styled but blank, are not headers.
+    """
+    width = len(row)
+    while width and row[width - 1] is None:
+        width -= 1
+    return [
+        f"Unnamed: {idx}" if value is None else str(value)
+        for idx, value in enumerate(row[:width])
+    ]
+
+
+def chunk_frames(
+    headers: typing.List[str],
+    rows: typing.Iterator[tuple],
+    chunk_size: int,
+) -> typing.Iterator[pd.DataFrame]:
+    """Groups the rows into dataframes of chunk_size rows each.
+    Index of the dataframes continues from the previous chunk.
+    """
+    width = len(headers)
+    start = 0
+    while True:
+        records = [
+            tuple(row[:width]) + (None,) * (width - len(row))
+            for row in islice(rows, chunk_size)
+        ]
+        if not records:
+            return
+        df = pd.DataFrame.from_records(records, columns=headers)
+        df.index += start
+        start += len(records)
+        yield df
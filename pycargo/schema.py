@@ -0,0 +1,186 @@
+import hashlib
+import typing
+from types import MappingProxyType
+
+from pycargo.fields import Field
+from pycargo.styles import Style, header_style, required_header_style
+from pycargo.validate import FileChoices, Required, Unique, Validator
+
+
+FieldsDict = typing.Mapping[str, Field]
+UniqueTogether = typing.Sequence[typing.Sequence[str]]
+# Validators of a field paired with their column forms
+ValidatorPlan = typing.Tuple[
+    typing.Tuple[typing.Callable, typing.Optional[typing.Callable]], ...
+]
+
+
+class Schema(typing.NamedTuple):
+    """
+    Facts about the fields of a spreadsheet computed once when the
+    class is created. Mappings are read-only and keep the order of the
+    fields.
+    fingerprint changes when anything which affects reading or
+    validating the file changes, and is the same across processes.
+    Files of choices are described by their size and modification
+    time when the fingerprint is read, so they are not read before
+    the choices are used.
+    Fields and validators not built into pycargo are only described
+    by their names, then fingerprint_complete is False and results of
+    validation must not be reused by fingerprint.
+    """
+
+    fields: typing.Mapping[str, Field]
+    required: typing.FrozenSet[str]
+    # Field name to header name and back
+    data_keys: typing.Mapping[str, str]
+    field_names: typing.Mapping[str, str]
+    # Validators except the cross row ones, with their column forms
+    plans: typing.Mapping[str, ValidatorPlan]
+    # Field names and the validator of every cross row check
+    checks: typing.Tuple[typing.Tuple[typing.Tuple[str, ...], Validator], ...]
+    header_styles: typing.Mapping[str, Style]
+    unique_together: typing.Tuple[typing.Tuple[str, ...], ...]
+    # Fingerprint of everything except the files of choices
+    static_fingerprint: str
+    fingerprint_complete: bool
+    choice_files: typing.Tuple[FileChoices, ...]
+
+    def __repr__(self):
+        return f"<Schema({list(self.fields)})>"
+
+    @property
+    def fingerprint(self) -> str:
+        if not self.choice_files:
+            return self.static_fingerprint
+        states = [file.state() for file in self.choice_files]
+        data = f"{self.static_fingerprint}:{states!r}"
+        return hashlib.sha256(data.encode()).hexdigest()
+
+    def __reduce__(self):
+        # Mapping proxies can not be pickled, compile again instead
+        return compile_schema, (dict(self.fields), self.unique_together)
+
+
+def is_cross_row(validator: typing.Any) -> bool:
+    return getattr(validator, "cross_row", False)
+
+
+def describe_validator(validator: typing.Callable) -> str:
+    """Returns a description of the validator which is the same
+    across processes, unlike the default repr of functions.
+    """
+    if isinstance(validator, Validator):
+        return validator.fingerprint()
+    name = getattr(validator, "__qualname__", None)
+    if name is None:
+        name = type(validator).__qualname__
+    return f"{getattr(validator, '__module__', '')}.{name}"
+
+
+def is_builtin(value: typing.Any) -> bool:
+    """Whether the field or validator is one of pycargo, fully
+    described by the fingerprint.
+    """
+    if isinstance(value, Field):
+        return type(value).__module__ == Field.__module__
+    return (
+        isinstance(value, Validator)
+        and type(value).__module__ == Validator.__module__
+    )
+
+
+def order_fields(
+    fields: FieldsDict, inherited: typing.Optional[FieldsDict] = None
+) -> typing.Dict[str, Field]:
+    """Inherited fields come first followed by the fields
+    in the order they were created. A field overriding an inherited
+    one keeps its position.
+    """
+    ordered = dict(inherited or {})
+    ordered.update(
+        sorted(fields.items(), key=lambda item: item[1]._creation_index)
+    )
+    return ordered
+
+
+def compile_schema(
+    fields: FieldsDict, unique_together: UniqueTogether = ()
+) -> Schema:
+    unique_together = tuple(tuple(names) for names in unique_together)
+    for names in unique_together:
+        for name in names:
+            if name not in fields:
+                raise ValueError(f"Unknown field '{name}' in unique_together")
+
+    required = frozenset(
+        name
+        for name, field in fields.items()
+        if any(
+            isinstance(validator, Required) for validator in field.validators
+        )
+    )
+    data_keys = {
+        name: field.data_key or name for name, field in fields.items()
+    }
+    plans = {}
+    checks = []
+    for name, field in fields.items():
+        plan = []
+        columns = field.column_validators()
+        for validator, column in zip(field.validators, columns):
+            if is_cross_row(validator):
+                checks.append(((name,), validator))
+            else:
+                plan.append((validator, column))
+        plans[name] = tuple(plan)
+    checks += [(names, Unique()) for names in unique_together]
+    header_styles = {
+        name: required_header_style if name in required else header_style
+        for name in fields
+    }
+    description = [
+        (
+            name,
+            type(field).__name__,
+            data_keys[name],
+            str(field.dtype),
+            field.comment,
+            [describe_validator(v) for v in field.validators],
+        )
+        for name, field in fields.items()
+    ]
+    description.append(unique_together)
+    fingerprint = hashlib.sha256(repr(description).encode()).hexdigest()
+    choice_files = tuple(
+        file
+        for field in fields.values()
+        for validator in field.validators
+        if isinstance(validator, Validator)
+        for file in validator._choice_files()
+    )
+    fingerprint_complete = all(
+        is_builtin(field) and all(map(is_builtin, field.validators))
+        for field in fields.values()
+    )
+    return Schema(
+        fields=MappingProxyType(dict(fields)),
+        required=required,
+        data_keys=MappingProxyType(data_keys),
+        field_names=MappingProxyType(
+            {key: name for name, key in data_keys.items()}
+        ),
+        plans=MappingProxyType(plans),
+        checks=tuple(checks),
+        header_styles=MappingProxyType(header_styles),
+        unique_together=unique_together,
+        static_fingerprint=fingerprint,
+        fingerprint_complete=fingerprint_complete,
+        choice_files=choice_files,
+    )
+
+
+def as_schema(fields: typing.Union[FieldsDict, Schema]) -> Schema:
+    if isinstance(fields, Schema):
+        return fields
+    return compile_schema(fields)
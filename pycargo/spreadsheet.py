@@ -1,30 +1,53 @@
 import typing
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing, nullcontext
+from itertools import islice
 from io import BytesIO
-from tempfile import NamedTemporaryFile
 
+import numpy as np
 import pandas as pd
 from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.workbook.workbook import Worksheet
 from openpyxl.comments import Comment
 
+from pycargo import aio
+from pycargo import cache as cache_
+from pycargo import checkpoints
 from pycargo import exceptions
+from pycargo import readers
 from pycargo import utils
+from pycargo import writers
 from pycargo.types import IterableStrOrNone, IterableStr
 from pycargo.styles import (
     Style,
     apply_style,
-    header_style,
-    required_header_style,
+    error_style,
 )
 from pycargo.fields import Field
-from pycargo.containers import RowIterator
-from pycargo import validate
+from pycargo.schema import compile_schema, order_fields
+from pycargo.stats import Stats
+from pycargo.containers import (
+    DuplicateIndex,
+    Row,
+    RowIterator,
+    RowStore,
+    ErrorsDict,
+    worker_pool,
+)
+
+
+template_cache = utils.LRUCache(maxsize=128)
+BATCH_KINDS = ("tuples", "records", "frame")
 
 
 class SpreadSheetMeta(type):
     def __new__(cls, name, bases, dict_):
-        """Add all the Fields of the spreadsheet
-        into the fields attribute and remove their references
+        """Add all the Fields of the spreadsheet, including the
+        fields of the base spreadsheets, into the fields attribute and
+        remove their references.
+        The fields are compiled once into the schema attribute which
+        the spreadsheet reads its headers, styles and validators from.
         Also creates a data_key_mapping attribute that
         keeps a mapping of data_key of the field and their
         actual names.
@@ -34,18 +57,36 @@ class SpreadSheetMeta(type):
             for field_name, field_value in dict_.items()
             if isinstance(field_value, Field)
         }
+        inherited = {}
+        for base in reversed(bases):
+            inherited.update(getattr(base, "fields", {}))
         class_ = type.__new__(cls, name, bases, dict_)
-        class_.fields = fields
-        class_.data_key_mapping = {}
-        for key, value in fields.items():
+        class_.schema = compile_schema(
+            order_fields(fields, inherited),
+            getattr(class_, "unique_together", ()),
+        )
+        class_.fields = class_.schema.fields
+        class_.data_key_mapping = class_.schema.field_names
+        for key in fields:
             del dict_[key]
-            class_.data_key_mapping[value.data_key or key] = key
         return class_
 
 
 class SpreadSheet(metaclass=SpreadSheetMeta):
-    def __init__(self):
-        pass
+    # Groups of field names whose values must be unique together,
+    # e.g. [("customer_id", "date")]
+    unique_together: typing.Sequence[typing.Sequence[str]] = ()
+    # Defaults for subclasses whose __init__ does not call this one
+    stats: typing.Optional[Stats] = None
+    checkpoint: typing.Optional[checkpoints.Checkpoint] = None
+    cache: typing.Optional[cache_.ParseCache] = None
+    cache_key: typing.Optional[str] = None
+
+    def __init__(self, stats: typing.Optional[Stats] = None):
+        """Pass a Stats object to measure the stages of loading and
+        the validators of every field, see Stats.as_dict().
+        """
+        self.stats = stats
 
     def __repr__(self) -> str:
         classname = self.__class__.__name__
@@ -73,9 +114,7 @@ class SpreadSheet(metaclass=SpreadSheetMeta):
         exported with a red background and optional fields
         have a green background.
         """
-        if self.is_field_required(field_name):
-            return required_header_style
-        return header_style
+        return self.schema.header_styles[field_name]
 
     def write_headers(
         self, sheet: typing.Type[Worksheet], only: IterableStrOrNone = None
@@ -87,29 +126,44 @@ class SpreadSheet(metaclass=SpreadSheetMeta):
         """
         fields = self.get_fields_for_export(only)
         for idx, header in enumerate(fields, start=1):
-            value = fields[header].data_key or header
+            value = self.schema.data_keys[header]
             cell = sheet.cell(column=idx, row=1, value=value)
-            apply_style(cell, self.get_header_style(header))
-            comment_text = fields[header].comment
-            if comment_text:
-                cell.comment = Comment(comment_text, author="")
+            self.format_header(cell, header)
+
+    def format_header(self, cell: typing.Type[Cell], header: str) -> None:
+        """Applies the header style and comment of the field
+        to the header cell.
+        """
+        apply_style(cell, self.get_header_style(header))
+        comment_text = self.fields[header].comment
+        if comment_text:
+            cell.comment = Comment(comment_text, author="")
+
+    def header_cells(
+        self, sheet: typing.Type[Worksheet], only: IterableStrOrNone = None
+    ) -> typing.List[WriteOnlyCell]:
+        """Method to return the styled header cells for
+        write-only worksheets.
+        """
+        cells = []
+        for header in self.get_fields_for_export(only):
+            cell = WriteOnlyCell(sheet, value=self.schema.data_keys[header])
+            self.format_header(cell, header)
+            cells.append(cell)
+        return cells
 
     def is_field_required(self, name: str) -> bool:
         """Checks whether the field is required or not.
         A field is required if it has validate.Required validator.
         """
-        field = self.fields[name]
-        for validator in field.validators:
-            if isinstance(validator, validate.Required):
-                return True
-        return False
+        return name in self.schema.required
 
     def required_fields(self) -> typing.List[str]:
         """Method to return field names of required fields"""
         return [
             field_name
             for field_name in self.fields
-            if self.is_field_required(field_name)
+            if field_name in self.schema.required
         ]
 
     def validate_headers(self, headers: IterableStr) -> None:
@@ -121,7 +175,7 @@ class SpreadSheet(metaclass=SpreadSheetMeta):
         the excel. Raises InvalidHeaderException it finds any.
         """
         for header in headers:
-            if header not in self.fields:
+            if header not in self.schema.fields:
                 raise exceptions.InvalidHeaderException(
                     f"Got unexpected field '{header}'"
                 )
@@ -131,20 +185,17 @@ class SpreadSheet(metaclass=SpreadSheetMeta):
         in the excel sheet or not. If a required field is missing,
         raise InvalidHeaderException.
         """
-        data_key_mapping_alt = {
-            name: data_key for data_key, name in self.data_key_mapping.items()
-        }
-        for field_name in self.required_fields():
-            if field_name not in headers:
+        missing = self.schema.required.difference(headers)
+        for field_name in self.schema.fields:
+            if field_name in missing:
                 raise exceptions.InvalidHeaderException(
                     f"Required field "
-                    f"'{data_key_mapping_alt[field_name]}' not given"
+                    f"'{self.schema.data_keys[field_name]}' not given"
                 )
 
     @property
     def headers(self) -> typing.List:
-        headers = [name for name, field in self.fields.items()]
-        return headers
+        return list(self.schema.fields)
 
     def get_field_name(self, name: str) -> str:
         """Field objects have data_key which is the external
@@ -154,7 +205,7 @@ class SpreadSheet(metaclass=SpreadSheetMeta):
         Method takes the external representation name 'data_key'
         and returns the actual name of the field.
         """
-        return self.data_key_mapping[name]
+        return self.schema.field_names[name]
 
     def generate_template(
         self,
@@ -175,28 +226,519 @@ class SpreadSheet(metaclass=SpreadSheetMeta):
         workbook = self.generate_template(only)
         workbook.save(path)
 
+    def export(
+        self,
+        data: writers.ExportData,
+        path_or_buffer: typing.Union[str, typing.BinaryIO],
+        only: IterableStrOrNone = None,
+    ) -> None:
+        """Export data to an excel file with the same headers as the
+        template. Data can be a dataframe, an iterable of dicts keyed by
+        field names or a generator yielding chunks of these.
+        Rows are streamed to a write-only workbook so memory does not
+        grow with the number of rows.
+        """
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(self.header_cells(sheet, only))
+        names = list(self.get_fields_for_export(only))
+        for record in writers.iter_records(data, names):
+            sheet.append(record)
+        workbook.save(path_or_buffer)
+
+    def export_errors(
+        self, path_or_buffer: typing.Union[str, typing.BinaryIO]
+    ) -> None:
+        """Export the loaded data back to an excel file with the
+        invalid cells highlighted and their errors added as comments.
+        Rows are streamed to a write-only workbook and only the cells
+        with errors are styled, so large reports fit in memory.
+        """
+        self.store.validate_all()
+        names = list(self.fields)
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append(self.header_cells(sheet))
+        records = writers.frame_records(self.df, names)
+        for position, record in enumerate(records):
+            if position not in self.store.errors:
+                sheet.append(record)
+                continue
+            errors = self.store.row_errors(position)
+            row = list(record)
+            for idx, name in enumerate(names):
+                if name in errors:
+                    row[idx] = self.error_cell(sheet, row[idx], errors[name])
+            sheet.append(row)
+        workbook.save(path_or_buffer)
+
+    def error_cell(
+        self,
+        sheet: typing.Type[Worksheet],
+        value: typing.Any,
+        errors: typing.List[str],
+    ) -> WriteOnlyCell:
+        """Returns a cell highlighted with the error style and
+        the errors as its comment.
+        """
+        cell = WriteOnlyCell(sheet)
+        apply_style(cell, error_style)
+        # Value is set after the style to keep the date formats
+        cell.value = value
+        cell.comment = Comment("\n".join(errors), author="")
+        return cell
+
+    def stage(self, name: str) -> typing.ContextManager:
+        """Measures the wall time of a stage of loading in stats,
+        does nothing without stats.
+        """
+        if self.stats is None:
+            return nullcontext()
+        return self.stats.stage(name)
+
     def template(self, only: IterableStrOrNone = None) -> typing.Type[BytesIO]:
         """
         Use this in your web apps to send file object to the client.
+        The workbook is written in memory and the bytes are cached per
+        spreadsheet class and only, so repeated calls do not build the
+        workbook again.
         """
-        workbook = self.generate_template(only)
-        with NamedTemporaryFile() as tmp:
-            workbook.save(tmp.name)
-            return BytesIO(tmp.read())
+        only = None if only is None else tuple(only)
+        key = (self.__class__, only, self.schema.fingerprint)
+        content = template_cache.get(key)
+        if content is None:
+            buffer = BytesIO()
+            self.generate_template(only).save(buffer)
+            content = buffer.getvalue()
+            template_cache.set(key, content)
+        return BytesIO(content)
 
-    def load(self, path: str) -> None:
-        """Load data from the excel file to dataframe.
+    def load(
+        self,
+        path: typing.Union[readers.Source, readers.Buffer],
+        workers: typing.Optional[int] = None,
+        format: typing.Optional[str] = None,
+        max_errors: typing.Optional[int] = None,
+        fail_fast: bool = False,
+        max_rows: typing.Optional[int] = None,
+        max_columns: typing.Optional[int] = None,
+        checkpoint: typing.Optional[checkpoints.Checkpoint] = None,
+        cache: typing.Optional[cache_.ParseCache] = None,
+    ) -> None:
+        """Load data from the file to dataframe. path can also be
+        the bytes, memoryview or file object of an upload, which are
+        read in place, paths are memory mapped.
         Also rename the dataframe's headers from their external
         representations to their actual field names.
         File headers are also validated on load.
+        Format is one of excel, csv, parquet or arrow, it is detected
+        from the extension or the first bytes of the file if not given.
+        workers is the default number of processes used by validate().
+        Validation stops after max_errors errors, or the first error
+        with fail_fast, see error_summary().
+        Headers and size limits are checked by preflight() before
+        the file is parsed, then only the declared columns are read.
+        With a checkpoint of the file, rows() resumes from its offset.
+        With a cache, a file loaded before by the same schema is read
+        from the cache instead of being parsed, and so are the errors
+        of validate().
+        """
+        format = format or readers.detect_format(path)
+        with readers.open_source(path) as source:
+            if checkpoint is not None:
+                self.verify_checkpoint(source, checkpoint)
+            key = None
+            if cache is not None:
+                with self.stage("cache"):
+                    key = cache.key(
+                        readers.content_hash(source),
+                        self.schema.fingerprint,
+                        format,
+                    )
+                    df = cache.get(key)
+                if df is not None:
+                    self.check_limits(
+                        len(df), len(df.columns), max_rows, max_columns
+                    )
+                    self.set_frame(df, workers, max_errors, fail_fast)
+                    self.checkpoint = checkpoint
+                    self.cache, self.cache_key = cache, key
+                    return
+            with self.stage("preflight"):
+                result = self.preflight(source, format, max_rows, max_columns)
+            columns = None
+            if result is not None:
+                columns = {
+                    header: self.fields[
+                        self.schema.field_names.get(header, header)
+                    ]
+                    for header in result.headers
+                }
+            with self.stage("parse"):
+                df = readers.read_frame(source, format, columns)
+            if result is None:
+                self.check_limits(
+                    len(df), len(df.columns), max_rows, max_columns
+                )
+            self.load_frame(df, workers, max_errors, fail_fast)
+            self.checkpoint = checkpoint
+            if cache is not None:
+                with self.stage("cache"):
+                    cache.set(key, self.df)
+                self.cache, self.cache_key = cache, key
+
+    def checkpoint_for(
+        self,
+        source: typing.Union[readers.Source, readers.Buffer],
+        store: typing.Optional[checkpoints.CheckpointStore] = None,
+    ) -> checkpoints.Checkpoint:
+        """Returns the checkpoint of the file saved in store, or a
+        checkpoint at the start of the file to resume later imports.
+        """
+        checkpoint = checkpoints.Checkpoint(
+            readers.content_hash(source), 0, self.schema.fingerprint
+        )
+        if store is not None:
+            return store.load(checkpoint.key) or checkpoint
+        return checkpoint
+
+    def verify_checkpoint(
+        self,
+        source: typing.Union[readers.Source, readers.Buffer],
+        checkpoint: checkpoints.Checkpoint,
+    ) -> None:
+        """Raises CheckpointException if the checkpoint was not made
+        for this file and schema.
+        """
+        if checkpoint.fingerprint != self.schema.fingerprint:
+            raise exceptions.CheckpointException(
+                "Checkpoint was made for different fields"
+            )
+        if checkpoint.content_hash != readers.content_hash(source):
+            raise exceptions.CheckpointException(
+                "Checkpoint was made for a different file"
+            )
+
+    def preflight(
+        self,
+        source: readers.Source,
+        format: typing.Optional[str] = None,
+        max_rows: typing.Optional[int] = None,
+        max_columns: typing.Optional[int] = None,
+    ) -> typing.Optional[readers.Preflight]:
+        """Check the headers and the size of the file without parsing
+        its rows, so that bad files are rejected in milliseconds.
+        Raises InvalidHeaderException for invalid headers and
+        LimitExceededException if the file has more than max_rows rows
+        or max_columns columns. Returns the headers and size of the file,
+        or None if the format has no preflight reader.
+        """
+        result = readers.preflight(source, format)
+        if result is None:
+            return None
+        headers = [
+            self.schema.field_names.get(header, header)
+            for header in result.headers
+        ]
+        self.validate_headers(headers)
+        self.check_limits(result.rows, result.columns, max_rows, max_columns)
+        return result
+
+    def check_limits(
+        self,
+        rows: typing.Optional[int],
+        columns: int,
+        max_rows: typing.Optional[int] = None,
+        max_columns: typing.Optional[int] = None,
+    ) -> None:
+        """Raises LimitExceededException if the file has more than
+        max_rows rows or max_columns columns. rows is None when unknown.
+        """
+        if max_columns is not None and columns > max_columns:
+            raise exceptions.LimitExceededException(
+                f"Got {columns} columns, at most {max_columns} are allowed"
+            )
+        if max_rows is not None and rows is not None and rows > max_rows:
+            raise exceptions.LimitExceededException(
+                f"Got {rows} rows, at most {max_rows} are allowed"
+            )
+
+    def load_frame(
+        self,
+        df: pd.DataFrame,
+        workers: typing.Optional[int] = None,
+        max_errors: typing.Optional[int] = None,
+        fail_fast: bool = False,
+    ) -> None:
+        """Load data from a dataframe with external header names,
+        the same way as load() does for files. Columns are cast to
+        the dtypes declared by their fields where no value changes.
         """
-        df = pd.read_excel(path)
-        self.df = df.rename(columns=self.data_key_mapping)
-        self.validate_headers(self.df.columns)
+        with self.stage("rename"):
+            df = df.rename(columns=dict(self.schema.field_names))
+        with self.stage("validate_headers"):
+            self.validate_headers(df.columns)
+        with self.stage("coerce"):
+            df = readers.coerce_frame(df, self.fields)
+        self.set_frame(df, workers, max_errors, fail_fast)
 
-    def rows(self) -> typing.Type[RowIterator]:
+    def set_frame(
+        self,
+        df: pd.DataFrame,
+        workers: typing.Optional[int] = None,
+        max_errors: typing.Optional[int] = None,
+        fail_fast: bool = False,
+    ) -> None:
+        """Sets the renamed and coerced dataframe as the loaded data."""
+        self.df = df
+        self.cache = self.cache_key = None
+        if fail_fast:
+            max_errors = 1
+        self.checkpoint = None
+        if self.stats is not None:
+            self.stats.rows += len(self.df)
+        self.store = RowStore(
+            self.df, self.schema, max_errors=max_errors, stats=self.stats
+        )
+        self.workers = workers
+
+    def validate(self, workers: typing.Optional[int] = None) -> ErrorsDict:
+        """Validate the loaded data a column at a time. This is much
+        faster than validating every cell of rows() for large files.
+        Returns the errors of invalid rows keyed by row position,
+        valid rows are not included. Errors are kept in the store
+        so rows() does not validate them again.
+        With workers, row chunks are validated in that many processes.
+        Errors of a full validation are kept in the cache of load()
+        when only fields and validators of pycargo are used, the cache
+        can not tell apart versions of others.
+        """
+        with self.stage("validate"):
+            if (
+                self.cache is None
+                or self.store.max_errors is not None
+                or not self.schema.fingerprint_complete
+            ):
+                return self.store.all_errors(workers or self.workers)
+            errors = None
+            if not self.store.validated.any():
+                errors = self.cache.get_errors(self.cache_key)
+            if errors is not None:
+                positions = np.arange(self.store.total_rows)
+                self.store.add_frame_errors(positions, errors)
+                return self.store.all_errors()
+            errors = self.store.all_errors(workers or self.workers)
+            self.cache.set_errors(self.cache_key, errors)
+            return errors
+
+    def error_summary(self) -> typing.Dict[str, typing.Any]:
+        """Returns the number of validated and invalid rows, the number
+        of errors and whether the error budget was exhausted.
+        """
+        return self.store.summary()
+
+    def rows(self, validate: bool = True) -> typing.Type[RowIterator]:
         """This can be used for iterating over the loaded rows.
         Rows are lazy loaded i.e they aren't loaded till the time they
-        are accessed.
+        are accessed. Cells are validated when their errors are
+        accessed, validate=False skips validation for trusted data.
+        When loaded with a checkpoint, rows start at its offset and the
+        checkpoint of the progress is self.checkpoint.advance(rows.offset).
+        """
+        store = self.store if validate else None
+        rows = RowIterator(self.df, self.schema, validate, store)
+        if self.checkpoint is not None:
+            rows = rows[self.checkpoint.offset :]
+        return rows
+
+    def batches(
+        self, size: int = 5000, valid_only: bool = True, kind: str = "tuples"
+    ) -> typing.Iterator[typing.Any]:
+        """Yields the loaded rows size rows at a time with the values
+        in the order of the fields, ready for bulk inserts. kind is
+        one of tuples for lists of tuples with None for null values,
+        records for numpy record arrays or frame for dataframe slices.
+        Every batch is validated a column at a time before it is
+        yielded and with valid_only its invalid rows are left out,
+        batches without valid rows are skipped. Stops once the error
+        budget is exhausted.
+        """
+        if kind not in BATCH_KINDS:
+            raise ValueError(
+                f"kind must be one of {', '.join(BATCH_KINDS)}, got '{kind}'"
+            )
+        names = list(self.fields)
+        workers, executor = None, None
+        if valid_only and self.workers and self.workers > 1:
+            # One pool for all the batches
+            executor = worker_pool(self.schema, self.workers)
+            if executor is not None:
+                workers = self.workers
+        with executor or nullcontext():
+            for start in range(0, len(self.df), size):
+                batch = self.df.iloc[start : start + size]
+                if valid_only:
+                    positions = np.arange(start, start + len(batch))
+                    self.store.validate_rows(positions, workers, executor)
+                    keep = (
+                        self.store.validated[positions]
+                        & ~self.store.invalid[positions]
+                    )
+                    if not keep.all():
+                        batch = batch[keep]
+                    if not len(batch):
+                        if self.store.exhausted:
+                            return
+                        continue
+                batch = batch.reindex(columns=names)
+                if kind == "tuples":
+                    yield list(writers.frame_records(batch, names, size))
+                elif kind == "records":
+                    yield batch.to_records(index=False)
+                else:
+                    yield batch
+                if valid_only and self.store.exhausted:
+                    return
+
+    def split(
+        self, workers: typing.Optional[int] = None
+    ) -> typing.Tuple[pd.DataFrame, pd.DataFrame]:
+        """Validates the loaded data and splits it into the valid rows
+        and the invalid rows with an errors column holding the errors
+        of each row, keyed by field name as in Row.errors.
+        Rows not validated because the error budget was exhausted are
+        in neither of them.
+        """
+        self.validate(workers)
+        valid = self.store.validated & ~self.store.invalid
+        invalid = self.store.invalid
+        errors = [
+            self.store.row_errors(position)
+            for position in np.flatnonzero(invalid)
+        ]
+        invalid_df = self.df[invalid].assign(errors=errors)
+        return self.df[valid], invalid_df
+
+    async def aload(
+        self, source: typing.Any, validate: bool = True, **kwargs
+    ) -> None:
+        """Async version of load() for web handlers. Source can be a
+        path, bytes or an async byte stream of the upload, kwargs are
+        passed to load().
+        Parsing and validation run in a shared bounded executor,
+        see aio.set_concurrency(), so the event loop is not blocked.
+        """
+        source = await aio.read_source(source)
+        await aio.run(self.load, source, **kwargs)
+        if validate:
+            await aio.run(self.validate)
+
+    async def arows(
+        self, batch_size: int = 1000
+    ) -> typing.AsyncIterator[typing.Type[Row]]:
+        """Async iterator over the loaded rows. Rows are validated
+        batch_size rows at a time in the shared executor.
         """
-        return RowIterator(self.df, self.fields)
+        rows = self.rows()
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            await aio.run(self.store.validate_rows, batch.positions)
+            for row in batch:
+                yield row
+
+    def stream(
+        self,
+        path: str,
+        chunk_size: int = 1000,
+        checkpoint: typing.Optional[checkpoints.Checkpoint] = None,
+    ) -> typing.Iterator[typing.Type[Row]]:
+        """Load and validate rows of a large excel file without
+        loading the whole file in memory. The file is read in
+        read-only mode, chunk_size rows at a time, so memory depends
+        on the chunk size and not on the size of the sheet.
+        Headers are validated before any row is read.
+        Duplicates are found across chunks, the keys of unique
+        fields are kept in memory.
+        With a checkpoint of the file, rows before its offset are
+        skipped without being validated and self.checkpoint is
+        advanced past every row returned, save it once the row is
+        processed to resume later.
+        """
+        skip = 0
+        if checkpoint is not None:
+            self.verify_checkpoint(path, checkpoint)
+            skip = checkpoint.offset
+        self.checkpoint = checkpoint
+        index = DuplicateIndex(self.schema, remember=True)
+        # Keys of the skipped rows are needed to find their duplicates
+        rows = readers.excel_rows(path, 0 if index else skip)
+        try:
+            headers = [
+                self.schema.field_names.get(header, header)
+                for header in readers.get_headers(next(rows, ()))
+            ]
+            self.validate_headers(headers)
+        except Exception:
+            rows.close()
+            raise
+        return self._stream_rows(headers, rows, chunk_size, index, skip)
+
+    def _stream_rows(
+        self,
+        headers: typing.List[str],
+        rows: typing.Iterator[tuple],
+        chunk_size: int,
+        index: DuplicateIndex,
+        skip: int,
+    ) -> typing.Iterator[typing.Type[Row]]:
+        with closing(rows):
+            if index and skip:
+                skipped = islice(rows, skip)
+                for df in readers.chunk_frames(headers, skipped, chunk_size):
+                    index.add(readers.coerce_frame(df, self.fields))
+            else:
+                index.offset = skip
+            for df in readers.chunk_frames(headers, rows, chunk_size):
+                df = readers.coerce_frame(df, self.fields)
+                store = RowStore(df, self.schema, duplicates=index.add(df))
+                for row in RowIterator(df, self.schema, store=store):
+                    # Advanced before the row is processed by the caller
+                    # which saves it afterwards
+                    if self.checkpoint is not None:
+                        self.checkpoint = self.checkpoint.advance(
+                            self.checkpoint.offset + 1
+                        )
+                    yield row
+
+
+def load_workbook(
+    path: readers.Source,
+    sheets: typing.Dict[str, typing.Type[SpreadSheet]],
+    validate: bool = True,
+    workers: typing.Optional[int] = None,
+    stats: typing.Optional[Stats] = None,
+) -> typing.Dict[str, SpreadSheet]:
+    """Load multiple sheets of an excel workbook, sheets maps the
+    sheet names to their SpreadSheet classes. The workbook is opened
+    and its shared strings are parsed once for all the sheets.
+    Sheets are then validated concurrently, each with workers
+    processes if given. Stats if given are shared by all the sheets.
+    Returns the loaded SpreadSheet of every sheet keyed by sheet name.
+    """
+    results = {}
+    with pd.ExcelFile(path) as excel_file:
+        for name, spreadsheet_class in sheets.items():
+            if name not in excel_file.sheet_names:
+                raise exceptions.InvalidSheetException(
+                    f"Sheet '{name}' not found"
+                )
+            spreadsheet = spreadsheet_class(stats)
+            with spreadsheet.stage("parse"):
+                df = excel_file.parse(name)
+            spreadsheet.load_frame(df, workers)
+            results[name] = spreadsheet
+
+    if validate and results:
+        with ThreadPoolExecutor(len(results)) as executor:
+            list(executor.map(SpreadSheet.validate, results.values()))
+    return results
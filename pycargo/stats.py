@@ -0,0 +1,85 @@
+import threading
+import time
+import typing
+from contextlib import contextmanager
+
+
+StageCallback = typing.Callable[[str, float], None]
+
+
+def validator_name(validator: typing.Callable) -> str:
+    name = getattr(validator, "__name__", None)
+    return name or validator.__class__.__name__
+
+
+class Stats:
+    """
+    Collects wall time of the loading stages and the number of calls,
+    failures and cumulative time of every validator of every field.
+    Pass it to a SpreadSheet to enable instrumentation, without it
+    nothing is measured. on_stage is called with the name and seconds
+    of every finished stage, e.g. to push timings to a metrics client.
+    Validators run on worker processes are not counted.
+    """
+
+    def __init__(self, on_stage: typing.Optional[StageCallback] = None):
+        self.on_stage = on_stage
+        self.stages = {}
+        self.rows = 0
+        self.validators = {}
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<Stats(rows={self.rows}, stages={self.stages})>"
+
+    @contextmanager
+    def stage(self, name: str) -> typing.Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            with self.lock:
+                self.stages[name] = self.stages.get(name, 0.0) + seconds
+            if self.on_stage is not None:
+                self.on_stage(name, seconds)
+
+    def count_validator(
+        self,
+        field_name: str,
+        validator: typing.Callable,
+        calls: int,
+        seconds: float,
+        failures: int,
+    ) -> None:
+        key = (field_name, validator_name(validator))
+        with self.lock:
+            counts = self.validators.setdefault(
+                key, {"calls": 0, "seconds": 0.0, "failures": 0}
+            )
+            counts["calls"] += calls
+            counts["seconds"] += seconds
+            counts["failures"] += failures
+
+    def rows_per_second(self, stage: str) -> typing.Optional[float]:
+        seconds = self.stages.get(stage)
+        if not seconds:
+            return None
+        return self.rows / seconds
+
+    def as_dict(self) -> typing.Dict[str, float]:
+        """Flat mapping of metric names to values, e.g.
+        stage.parse.seconds or validator.code.Range.failures
+        """
+        metrics = {"rows": self.rows}
+        with self.lock:
+            for stage, seconds in self.stages.items():
+                metrics[f"stage.{stage}.seconds"] = seconds
+                if seconds:
+                    metrics[f"stage.{stage}.rows_per_second"] = (
+                        self.rows / seconds
+                    )
+            for (field_name, name), counts in self.validators.items():
+                for counter, value in counts.items():
+                    metrics[f"validator.{field_name}.{name}.{counter}"] = value
+        return metrics
@@ -30,6 +30,20 @@ required_fill = PatternFill(
     fill_type="solid",
     start_color="00800000",
 )
+error_font = Font(
+    name="Calibri",
+    size=11,
+    bold=False,
+    italic=False,
+    vertAlign=None,
+    underline="none",
+    strike=False,
+    color="00000000",
+)
+error_fill = PatternFill(
+    fill_type="solid",
+    start_color="00FFC7CE",
+)
 border = Border(
     left=Side(border_style=None, color="FF000000"),
     right=Side(border_style=None, color="FF000000"),
@@ -97,3 +111,12 @@ required_header_style = Style(
     number_format=number_format,
     protection=protection,
 )
+
+error_style = Style(
+    font=error_font,
+    fill=error_fill,
+    border=border,
+    alignment=alignment,
+    number_format=number_format,
+    protection=protection,
+)
@@ -0,0 +1,65 @@
+import asyncio
+import threading
+
+import pandas as pd
+
+from pycargo import aio
+from pycargo.tests.test_spreadsheet import CustomerSpreadSheet
+
+
+def to_bytes(df):
+    return df.to_csv(index=False).encode()
+
+
+class TestAload:
+    def test_bytes(self):
+        async def load():
+            sheet = CustomerSpreadSheet()
+            await sheet.aload(to_bytes(pd.DataFrame({"Code": [1, 2]})))
+            return [row["code"].value async for row in sheet.arows()]
+
+        assert asyncio.run(load()) == [1, 2]
+
+    def test_async_stream(self):
+        content = to_bytes(pd.DataFrame({"name": ["Foo"], "Code": [None]}))
+
+        async def upload():
+            for start in range(0, len(content), 4):
+                yield content[start : start + 4]
+
+        async def load():
+            sheet = CustomerSpreadSheet()
+            await sheet.aload(upload(), format="csv", validate=False)
+            return [row.errors async for row in sheet.arows(batch_size=1)]
+
+        errors = asyncio.run(load())
+        assert errors[0]["code"] == ["Value must be integer", "Required field"]
+
+    def test_set_concurrency(self):
+        aio.set_concurrency(2)
+        assert aio.get_executor()._max_workers == 2
+
+    def test_limit_kept_when_changed(self):
+        running = []
+        release = threading.Event()
+
+        def job():
+            running.append(None)
+            release.wait(5)
+            running.pop()
+
+        async def main():
+            aio.set_concurrency(1)
+            first = asyncio.ensure_future(aio.run(job))
+            await asyncio.sleep(0.05)
+            aio.set_concurrency(1)
+            second = asyncio.ensure_future(aio.run(job))
+            await asyncio.sleep(0.05)
+            assert len(running) == 1
+            release.set()
+            await asyncio.gather(first, second)
+
+        try:
+            asyncio.run(main())
+        finally:
+            aio.set_concurrency(4)
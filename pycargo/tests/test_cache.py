@@ -0,0 +1,48 @@
+import os
+import time
+
+import pandas as pd
+import pandas.testing as tm
+
+from pycargo.cache import ParseCache
+
+
+class TestParseCache:
+    def test_round_trip(self, tmp_path):
+        cache = ParseCache(tmp_path)
+        df = pd.DataFrame(
+            {
+                "name": pd.array(["a", None], dtype="string"),
+                "code": pd.array([1, None], dtype="Int64"),
+                "mixed": [1, "a"],
+            }
+        )
+        assert cache.get("key") is None
+        cache.set("key", df)
+        tm.assert_frame_equal(cache.get("key"), df)
+        cache.set_errors("key", {1: {"code": ["Required field"]}})
+        assert cache.get_errors("key") == {1: {"code": ["Required field"]}}
+
+    def test_feather_keeps_values(self, tmp_path):
+        cache = ParseCache(tmp_path)
+        cache.set("strings", pd.DataFrame({"name": ["a", None]}))
+        cache.set("mixed", pd.DataFrame({"code": [1, None]}, dtype=object))
+        assert sorted(os.listdir(tmp_path)) == [
+            "mixed.pkl",
+            "strings.feather",
+        ]
+        assert cache.get("mixed")["code"].tolist() == [1, None]
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        df = pd.DataFrame({"code": range(1000)})
+        cache = ParseCache(tmp_path)
+        cache.set("first", df)
+        cache.max_bytes = cache.size() * 2
+        time.sleep(0.01)
+        cache.set("second", df)
+        time.sleep(0.01)
+        cache.get("first")
+        cache.set("third", df)
+        assert cache.get("second") is None
+        assert cache.get("first") is not None
+        assert cache.get("third") is not None
@@ -0,0 +1,38 @@
+import pytest
+
+from pycargo import utils
+from pycargo.checkpoints import Checkpoint, CheckpointStore, FileStore
+from pycargo.exceptions import CheckpointException
+
+
+class TestCheckpoint:
+    def test_token(self):
+        checkpoint = Checkpoint("abc", 10, "def")
+        assert Checkpoint.from_token(checkpoint.token) == checkpoint
+        assert Checkpoint.from_token(checkpoint.token.encode()) == checkpoint
+        assert checkpoint.advance(20).key == checkpoint.key
+
+    def test_invalid_token(self):
+        with pytest.raises(CheckpointException):
+            Checkpoint.from_token("abc:10")
+
+
+class TestCheckpointStore:
+    @pytest.mark.parametrize("kind", ["file", "cache"])
+    def test_save_and_load(self, tmp_path, kind):
+        if kind == "file":
+            client = FileStore(tmp_path / "checkpoints.json")
+        else:
+            client = utils.LRUCache()
+        store = CheckpointStore(client)
+        checkpoint = Checkpoint("abc", 10, "def")
+        assert store.load(checkpoint.key) is None
+        store.save(checkpoint)
+        store.save(checkpoint.advance(20))
+        assert store.load(checkpoint.key) == checkpoint.advance(20)
+
+    def test_file_store_delete(self, tmp_path):
+        client = FileStore(tmp_path / "checkpoints.json")
+        client.set("a", "1")
+        client.delete("a")
+        assert client.get("a") is None
@@ -1,10 +1,13 @@
 from dataclasses import dataclass, field
 from typing import Any, Optional
 
+import numpy as np
+import pandas as pd
 import pytest
 
-from pycargo import containers
-from pycargo.exceptions import ValidationException
+from pycargo import containers, fields, validate
+from pycargo.schema import compile_schema
+from pycargo.exceptions import NotValidatedException, ValidationException
 
 
 @dataclass
@@ -56,6 +59,18 @@ class TestCell:
         cell = containers.Cell(10, mock_field)
         assert len(cell.errors) == 0
 
+    def test_validate_on_first_access(self):
+        calls = []
+        cell = containers.Cell(10, MockField(validators=[calls.append]))
+        assert calls == []
+        assert cell.errors == []
+        assert cell.errors == []
+        assert calls == [10]
+
+    def test_without_validation(self):
+        cell = containers.Cell(20, MockField(), validate=False)
+        assert cell.errors == []
+
 
 class TestRow:
     def test_errors(self, row_cells):
@@ -132,3 +147,276 @@ class TestGetRowObj:
         }
         actual = containers.get_row_obj(data, field_mapping)
         assert actual.as_dict().keys() == {"code", "name", "status", "errors"}
+
+
+class TestValidateFrame:
+    @pytest.fixture
+    def fields(self):
+        return {
+            "code": fields.IntegerField(
+                validate=[validate.Required(), validate.Range(min=1)]
+            ),
+            "name": fields.StringField(validate=always_raising_error),
+            "status": fields.StringField(),
+        }
+
+    def test_same_errors_as_cells(self, fields):
+        df = pd.DataFrame({"code": [1, 0, 5], "name": ["a", "b", "c"]})
+        expected = {}
+        for position in range(len(df)):
+            row = containers.get_row_obj(dict(df.iloc[position]), fields)
+            if row.errors:
+                expected[position] = row.errors
+        assert containers.validate_frame(df, fields) == expected
+
+    def test_errors_in_validator_order(self, fields):
+        df = pd.DataFrame({"code": [np.nan], "name": ["a"]})
+        actual = containers.validate_frame(df, fields)
+        assert actual[0]["code"] == ["Value must be integer", "Required field"]
+        assert actual[0]["status"] == ["Value must be string"]
+
+    @pytest.mark.parametrize(
+        "field_class, values",
+        [
+            ("EmailField", ["a@b.com", "not-an-email"]),
+            ("UrlField", ["https://example.com", "not-a-url"]),
+            ("DomainField", ["example.com", "not a domain"]),
+        ],
+    )
+    def test_string_subclasses_same_as_cells(self, field_class, values):
+        field_mapping = {"value": getattr(fields, field_class)()}
+        df = pd.DataFrame({"value": values * 20})
+        expected = {}
+        for position in range(len(df)):
+            row = containers.get_row_obj(
+                dict(df.iloc[position]), field_mapping
+            )
+            if row.errors:
+                expected[position] = row.errors
+        assert len(expected) == 20
+        assert containers.validate_frame(df, field_mapping) == expected
+
+
+class TestRowIterator:
+    @pytest.fixture
+    def rows(self):
+        df = pd.DataFrame(
+            {
+                "code": [1, 2, 3],
+                "price": [1.5, 2.5, np.nan],
+                "added_on": pd.to_datetime(["2021-01-01"] * 3),
+            }
+        )
+        field_mapping = {
+            "code": fields.IntegerField(),
+            "price": fields.FloatField(),
+            "added_on": fields.DateTimeField(),
+            "name": fields.StringField(),
+        }
+        return containers.RowIterator(df, field_mapping)
+
+    def test_keeps_column_types(self, rows):
+        row = rows[0]
+        assert isinstance(row["code"].value, np.int64)
+        assert isinstance(row["added_on"].value, pd.Timestamp)
+        assert row.errors == {"name": ["Value must be string"]}
+
+    def test_len_and_iteration(self, rows):
+        assert len(rows) == 3
+        assert [row["code"].value for row in rows] == [1, 2, 3]
+
+    def test_random_access(self, rows):
+        assert rows[-1]["code"].value == 3
+        with pytest.raises(IndexError):
+            rows[3]
+
+    def test_slicing(self, rows):
+        sliced = rows[1:]
+        assert len(sliced) == 2
+        assert [row["code"].value for row in sliced] == [2, 3]
+
+    def test_without_validation(self):
+        df = pd.DataFrame({"code": ["abc"]})
+        field_mapping = {"code": fields.IntegerField()}
+        rows = containers.RowIterator(df, field_mapping, validate=False)
+        assert rows[0].errors == {}
+
+
+class TestRowStore:
+    @pytest.fixture
+    def store(self):
+        df = pd.DataFrame({"code": [1, 0, 0, 4]})
+        field_mapping = {
+            "code": fields.IntegerField(validate=validate.Range(min=1)),
+            "name": fields.StringField(),
+        }
+        return containers.RowStore(df, field_mapping)
+
+    def test_validate_row_lazily(self, store):
+        assert store.row_errors(1) == {
+            "code": ["Must be greater than or equal to 1."],
+            "name": ["Value must be string"],
+        }
+        assert store.validated.tolist() == [False, True, False, False]
+
+    def test_messages_are_stored_once(self, store):
+        store.validate_all()
+        assert sorted(store.errors) == [0, 1, 2, 3]
+        assert len(store.messages) == 2
+
+    def test_all_errors_same_as_lazy_validation(self, store):
+        expected = {
+            position: store.row_errors(position) for position in [1, 2]
+        }
+        assert store.all_errors() == {
+            **expected,
+            0: {"name": ["Value must be string"]},
+            3: {"name": ["Value must be string"]},
+        }
+
+    def test_row_view(self, store):
+        row = containers.RowView(store, 3)
+        assert row["code"].value == 4
+        assert row["name"].value is None
+        assert row.as_dict() == {
+            "code": 4,
+            "name": None,
+            "errors": {"name": ["Value must be string"]},
+        }
+        with pytest.raises(KeyError):
+            row["status"]
+
+
+class TestValidateFrameParallel:
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({"code": [1, 0, 5, -1, 3], "name": list("abcde")})
+
+    def test_same_errors_as_serial(self, df):
+        field_mapping = {
+            "code": fields.IntegerField(validate=validate.Range(min=1)),
+            "name": fields.StringField(validate=validate.OneOf("abc")),
+        }
+        expected = containers.validate_frame(df, field_mapping)
+        for workers in (2, 8):
+            actual = containers.validate_frame_parallel(
+                df, field_mapping, workers
+            )
+            assert actual == expected
+
+    def test_unpicklable_validator(self, df):
+        field_mapping = {"code": fields.IntegerField(validate=lambda v: v)}
+        with pytest.warns(RuntimeWarning):
+            actual = containers.validate_frame_parallel(df, field_mapping, 2)
+        assert actual == {}
+
+
+class TestErrorBudget:
+    @pytest.fixture
+    def df(self):
+        return pd.DataFrame({"code": ["a"] * 10})
+
+    @pytest.fixture
+    def field_mapping(self):
+        return {"code": fields.IntegerField()}
+
+    def test_validate_all_stops_at_budget(self, df, field_mapping):
+        store = containers.RowStore(df, field_mapping, max_errors=3)
+        store.budget_chunk_size = 2
+        assert list(store.all_errors()) == [0, 1, 2]
+        assert store.summary() == {
+            "validated_rows": 3,
+            "invalid_rows": 3,
+            "errors": 3,
+            "exhausted": True,
+        }
+
+    def test_one_pool_for_all_chunks(self, df, field_mapping, monkeypatch):
+        pools = []
+        worker_pool = containers.worker_pool
+
+        def counting_pool(*args):
+            pools.append(worker_pool(*args))
+            return pools[-1]
+
+        monkeypatch.setattr(containers, "worker_pool", counting_pool)
+        store = containers.RowStore(df, field_mapping, max_errors=5)
+        store.budget_chunk_size = 2
+        assert list(store.all_errors(workers=2)) == [0, 1, 2, 3, 4]
+        assert len(pools) == 1
+
+    def test_iteration_stops_at_budget(self, df, field_mapping):
+        store = containers.RowStore(df, field_mapping, max_errors=2)
+        rows = containers.RowIterator(df, field_mapping, store=store)
+        errors = [row.errors for row in rows]
+        assert len(errors) == 2
+
+    def test_rows_validated_before_budget(self, field_mapping):
+        df = pd.DataFrame({"code": [1, "a", 2, "b"]})
+        store = containers.RowStore(df, field_mapping, max_errors=1)
+        assert list(store.all_errors()) == [1]
+        rows = containers.RowIterator(df, field_mapping, store=store)
+        assert [row.errors for row in rows] == [
+            {},
+            {"code": ["Value must be integer"]},
+        ]
+        assert not rows[3].validated
+        with pytest.raises(NotValidatedException):
+            rows[3].errors
+
+
+class TestDuplicateIndex:
+    @pytest.fixture
+    def fields(self):
+        return {
+            "code": fields.IntegerField(validate=[validate.Unique()]),
+            "name": fields.StringField(),
+        }
+
+    def test_unique_field(self, fields):
+        df = pd.DataFrame(
+            {"code": pd.array([1, 2, 1, None, None, 1]), "name": "a"}
+        )
+        errors = containers.validate_frame(df, fields)
+        assert errors == {
+            2: {"code": ["Duplicate of row 2"]},
+            3: {"code": ["Value must be integer"]},
+            4: {"code": ["Value must be integer"]},
+            5: {"code": ["Duplicate of row 2"]},
+        }
+
+    def test_unique_together(self, fields):
+        df = pd.DataFrame({"code": [1, 1, 1], "name": ["a", "b", "a"]})
+        schema = compile_schema(
+            {"code": fields["name"], "name": fields["name"]},
+            [("code", "name")],
+        )
+        index = containers.DuplicateIndex(schema)
+        assert index.add(df) == {
+            2: {
+                "code": ["Duplicate of row 2"],
+                "name": ["Duplicate of row 2"],
+            }
+        }
+
+    def test_position_in_message(self):
+        unique = validate.Unique("Same as data row {position}")
+        field_mapping = {"code": fields.IntegerField(validate=[unique])}
+        df = pd.DataFrame({"code": [1, 1]})
+        assert containers.validate_frame(df, field_mapping) == {
+            1: {"code": ["Same as data row 0"]}
+        }
+
+    def test_remembers_across_frames(self, fields):
+        index = containers.DuplicateIndex(fields, remember=True)
+        assert index.add(pd.DataFrame({"code": [1, 2]})) == {}
+        assert index.add(pd.DataFrame({"code": [3, 2]})) == {
+            1: {"code": ["Duplicate of row 3"]}
+        }
+
+    def test_store_checks_all_rows(self, fields):
+        df = pd.DataFrame({"code": [1, 2, 1], "name": ["a", None, "b"]})
+        store = containers.RowStore(df, fields, max_errors=10)
+        store.budget_chunk_size = 1
+        assert store.row_errors(2) == {"code": ["Duplicate of row 2"]}
+        assert store.all_errors() == containers.validate_frame(df, fields)
@@ -0,0 +1,185 @@
+import zipfile
+from io import BytesIO
+
+import pandas as pd
+import pytest
+
+from pycargo import fields, readers
+from pycargo.exceptions import PyCargoException
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({"name": ["Foo", "Bar"], "Code": [1, 2]})
+
+
+class TestDetectFormat:
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("data.xlsx", "excel"),
+            ("data.CSV", "csv"),
+            ("data.parquet", "parquet"),
+            ("data.feather", "arrow"),
+        ],
+    )
+    def test_by_extension(self, path, expected):
+        assert readers.detect_format(path) == expected
+
+    def test_by_magic_bytes(self, df):
+        buffer = BytesIO()
+        df.to_excel(buffer, index=False)
+        buffer.seek(0)
+        assert readers.detect_format(buffer) == "excel"
+        assert buffer.tell() == 0
+
+    def test_fallback_to_csv(self, tmp_path):
+        path = tmp_path / "upload"
+        path.write_text("name,Code\nFoo,1\n")
+        assert readers.detect_format(path) == "csv"
+
+
+class TestReadFrame:
+    def test_csv(self, tmp_path, df):
+        path = tmp_path / "data.csv"
+        df.to_csv(path, index=False)
+        pd.testing.assert_frame_equal(readers.read_frame(path), df)
+
+    def test_parquet(self, tmp_path, df):
+        pytest.importorskip("pyarrow")
+        path = tmp_path / "data.parquet"
+        df.to_parquet(path, index=False)
+        pd.testing.assert_frame_equal(readers.read_frame(path), df)
+
+    def test_explicit_format(self, tmp_path, df):
+        path = tmp_path / "upload"
+        df.to_csv(path, index=False)
+        pd.testing.assert_frame_equal(readers.read_frame(path, "csv"), df)
+
+    def test_csv_blank_text_is_missing(self, tmp_path):
+        path = tmp_path / "data.csv"
+        path.write_text("name,Code,kind\n,1,NA\nFoo,2,x\n")
+        columns = {
+            "name": fields.StringField(),
+            "Code": fields.IntegerField(),
+            "kind": fields.StringField(),
+        }
+        for df in (
+            readers.read_frame(path),
+            readers.read_frame(path, columns=columns),
+        ):
+            assert df["name"].isna().tolist() == [True, False]
+            assert df["kind"].isna().tolist() == [True, False]
+
+    @pytest.mark.parametrize(
+        "version, expected", [("1.3.5", "c"), ("1.4.0", "pyarrow")]
+    )
+    def test_csv_engine(self, monkeypatch, version, expected):
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(pd, "__version__", version)
+        assert readers.csv_engine() == expected
+
+    def test_unsupported_format(self, df):
+        with pytest.raises(PyCargoException):
+            readers.read_frame("data.csv", "json")
+
+
+class TestCoerceColumn:
+    def test_integral_floats_to_nullable_integer(self):
+        series = readers.coerce_column(pd.Series([1.0, None]), "Int64")
+        assert str(series.dtype) == "Int64"
+
+    def test_fractional_floats_are_kept(self):
+        series = pd.Series([1.5, None])
+        assert readers.coerce_column(series, "Int64") is series
+
+    def test_integers_to_float(self):
+        series = readers.coerce_column(pd.Series([1, 2]), "float64")
+        assert series.dtype == "float64"
+        large = pd.Series([2**60, 1])
+        assert readers.coerce_column(large, "float64") is large
+
+    def test_booleans(self):
+        series = pd.Series([True, None], dtype=object)
+        assert readers.coerce_column(series, "boolean").dtype == "boolean"
+        integers = pd.Series([1, 0])
+        assert readers.coerce_column(integers, "boolean") is integers
+
+    def test_strings(self):
+        series = pd.Series(["a", None, "b"], dtype=object)
+        assert readers.coerce_column(series, "category").dtype == "category"
+        mixed = pd.Series(["a", 1], dtype=object)
+        assert readers.coerce_column(mixed, "string") is mixed
+
+
+class TestReadOptions:
+    def test_csv_dtypes(self, tmp_path):
+        path = tmp_path / "data.csv"
+        path.write_text("name,Code,created_on,extra\nFoo,1,2021-01-01,x\n")
+        columns = {
+            "name": fields.StringField(),
+            "Code": fields.IntegerField(),
+            "created_on": fields.DateTimeField(),
+        }
+        df = readers.read_frame(path, columns=columns)
+        assert list(df.columns) == ["name", "Code", "created_on"]
+        assert df["name"].dtype == "string"
+        assert df["created_on"].dtype.kind == "M"
+
+
+class TestPreflight:
+    def test_excel(self, tmp_path, df):
+        path = tmp_path / "data.xlsx"
+        df.to_excel(path, index=False)
+        result = readers.preflight(path)
+        assert result == readers.Preflight(["name", "Code"], 2, 2)
+
+    @pytest.mark.parametrize(
+        "name, content",
+        [
+            ("legacy.xls", b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1" + bytes(504)),
+            ("data.ods", None),
+        ],
+    )
+    def test_skips_workbooks_openpyxl_can_not_read(
+        self, tmp_path, name, content
+    ):
+        path = tmp_path / name
+        if content is None:
+            with zipfile.ZipFile(path, "w") as archive:
+                archive.writestr("content.xml", "<office:document/>")
+        else:
+            path.write_bytes(content)
+        assert readers.preflight(path, "excel") is None
+
+
+class TestMemoryReader:
+    def test_read_and_seek(self):
+        data = bytearray(b"0123456789")
+        reader = readers.MemoryReader(data)
+        assert reader.read(3) == b"012"
+        buffer = bytearray(4)
+        assert reader.readinto(buffer) == 4
+        assert buffer == b"3456"
+        assert reader.seek(-2, 2) == 8
+        assert reader.read() == b"89"
+        assert reader.read(1) == b""
+        reader.close()
+        data.append(0)  # buffer is released on close
+
+    def test_open_source(self, tmp_path, df):
+        path = tmp_path / "customers.csv"
+        df.to_csv(path, index=False)
+        empty = tmp_path / "empty.csv"
+        empty.write_bytes(b"")
+        content = path.read_bytes()
+        for source in (path, content, memoryview(content), BytesIO(content)):
+            with readers.open_source(source) as file:
+                assert readers.content_hash(file) == readers.content_hash(
+                    content
+                )
+                pd.testing.assert_frame_equal(
+                    readers.read_frame(file, "csv"), df
+                )
+        with readers.open_source(empty) as file:
+            assert file.read() == b""
@@ -0,0 +1,120 @@
+import os
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from pycargo import fields, validate
+from pycargo.schema import compile_schema
+from pycargo.spreadsheet import SpreadSheet
+from pycargo.styles import header_style, required_header_style
+
+
+class BaseSpreadSheet(SpreadSheet):
+    code = fields.IntegerField(validate=[validate.Required()], data_key="Code")
+    name = fields.StringField()
+
+
+class ProductSpreadSheet(BaseSpreadSheet):
+    sku = fields.StringField(validate=validate.Unique())
+    name = fields.StringField(data_key="Name")
+
+
+class TestSchema:
+    def test_inherited_fields_first(self):
+        schema = ProductSpreadSheet.schema
+        assert list(schema.fields) == ["code", "name", "sku"]
+        assert schema.data_keys == {
+            "code": "Code",
+            "name": "Name",
+            "sku": "sku",
+        }
+        assert schema.field_names["Name"] == "name"
+        assert list(BaseSpreadSheet.fields) == ["code", "name"]
+
+    def test_compiled_facts(self):
+        schema = ProductSpreadSheet.schema
+        assert schema.required == {"code"}
+        assert schema.header_styles["code"] is required_header_style
+        assert schema.header_styles["sku"] is header_style
+        assert [names for names, _ in schema.checks] == [("sku",)]
+        assert len(schema.plans["sku"]) == 1
+
+    def test_read_only(self):
+        with pytest.raises(TypeError):
+            ProductSpreadSheet.fields["price"] = fields.FloatField()
+
+    def test_fingerprint(self):
+        schema = ProductSpreadSheet.schema
+        assert pickle.loads(pickle.dumps(schema)).fingerprint == (
+            schema.fingerprint
+        )
+        assert BaseSpreadSheet.schema.fingerprint != schema.fingerprint
+
+    def test_fingerprint_same_across_hash_seeds(self):
+        code = (
+            "from pycargo import fields, validate\n"
+            "from pycargo.schema import compile_schema\n"
+            "choices = [str(i) for i in range(100)]\n"
+            "field = fields.StringField(validate=[\n"
+            "    validate.OneOf(set(choices)),\n"
+            "    validate.NoneOf(frozenset(choices[:50])),\n"
+            "])\n"
+            "print(compile_schema({'code': field}).fingerprint)\n"
+        )
+        fingerprints = set()
+        for seed in ("1", "2", "3"):
+            env = dict(os.environ, PYTHONHASHSEED=seed)
+            result = subprocess.run(
+                [sys.executable, "-c", code],
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            fingerprints.add(result.stdout)
+        assert len(fingerprints) == 1
+
+    @pytest.mark.parametrize(
+        "validator, changed",
+        [
+            (validate.Required(), validate.Required("Missing")),
+            (validate.Range(1, 5), validate.Range(1, 5, error="Bad")),
+            (validate.Equal(1), validate.Equal(1, "Not one")),
+            (
+                validate.OneOf(range(100)),
+                validate.OneOf([*range(99), 100]),
+            ),
+        ],
+    )
+    def test_fingerprint_changes(self, validator, changed):
+        def fingerprint(validator):
+            field = fields.IntegerField(validate=validator)
+            return compile_schema({"code": field}).fingerprint
+
+        assert fingerprint(validator) != fingerprint(changed)
+
+    def test_fingerprint_choices_file(self, tmp_path):
+        path = tmp_path / "codes.txt"
+        validator = validate.OneOf.from_file(str(path))
+
+        class CodeSpreadSheet(SpreadSheet):
+            code = fields.StringField(validate=validator)
+
+        schema = CodeSpreadSheet.schema
+        missing = schema.fingerprint
+        path.write_text("a\nb\n")
+        created = schema.fingerprint
+        path.write_text("a\nb\nc\n")
+        edited = schema.fingerprint
+        assert len({missing, created, edited}) == 3
+        assert validator._choices.compiled is None
+        # Choices in use are kept when the file changes afterwards
+        validator("c")
+        path.write_text("a\n")
+        assert schema.fingerprint == edited
+
+    def test_unknown_unique_together(self):
+        with pytest.raises(ValueError):
+            compile_schema(ProductSpreadSheet.fields, [("sku", "price")])
@@ -0,0 +1,621 @@
+import datetime
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+
+from pycargo import containers, fields, validate
+from pycargo.checkpoints import CheckpointStore, FileStore
+from pycargo.exceptions import (
+    CheckpointException,
+    InvalidHeaderException,
+    InvalidSheetException,
+    LimitExceededException,
+    NotValidatedException,
+    ValidationException,
+)
+from pycargo import readers, spreadsheet
+from pycargo.cache import ParseCache
+from pycargo.spreadsheet import SpreadSheet
+from pycargo.stats import Stats
+
+
+class CustomerSpreadSheet(SpreadSheet):
+    name = fields.StringField(comment="Customer Name")
+    code = fields.IntegerField(validate=[validate.Required()], data_key="Code")
+    created_on = fields.DateTimeField()
+
+
+def write_workbook(path, rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    workbook.save(path)
+    return path
+
+
+@pytest.fixture
+def customers_file(tmp_path):
+    return write_workbook(
+        tmp_path / "customers.xlsx",
+        [
+            ["name", "Code", "created_on"],
+            ["Foo", 1, datetime.datetime(2021, 1, 1)],
+            ["Bar", 2, datetime.datetime(2021, 1, 2)],
+            ["Baz", 3, datetime.datetime(2021, 1, 3)],
+        ],
+    )
+
+
+class TestStream:
+    def test_same_rows_as_load(self, customers_file):
+        sheet = CustomerSpreadSheet()
+        sheet.load(customers_file)
+        expected = [row.as_dict() for row in sheet.rows()]
+        for chunk_size in (1, 2, 10):
+            rows = sheet.stream(customers_file, chunk_size=chunk_size)
+            assert [row.as_dict() for row in rows] == expected
+
+    def test_validates_rows(self, tmp_path):
+        path = write_workbook(
+            tmp_path / "customers.xlsx",
+            [["name", "Code"], ["Foo", 1], [None, None], ["Bar", 2]],
+        )
+        rows = list(CustomerSpreadSheet().stream(path, chunk_size=1))
+        assert [row.errors for row in rows] == [
+            {"created_on": ["None not a valid datetime"]},
+            {
+                "name": ["Value must be string"],
+                "code": ["Value must be integer", "Required field"],
+                "created_on": ["None not a valid datetime"],
+            },
+            {"created_on": ["None not a valid datetime"]},
+        ]
+
+    def test_chunks_cast_to_field_dtypes(self, tmp_path):
+        class PriceSpreadSheet(SpreadSheet):
+            code = fields.IntegerField()
+            price = fields.FloatField()
+
+        path = write_workbook(
+            tmp_path / "prices.xlsx",
+            [["code", "price"], [1, 1.5], [None, 2], [3, 4]],
+        )
+        rows = list(PriceSpreadSheet().stream(path, chunk_size=2))
+        assert [row.errors for row in rows] == [
+            {},
+            {"code": ["Value must be integer"]},
+            {},
+        ]
+
+    def test_first_sheet_when_another_is_active(self, tmp_path):
+        workbook = Workbook()
+        workbook.active.append(["name", "Code"])
+        workbook.active.append(["Foo", 1])
+        workbook.create_sheet().append(["other"])
+        workbook.active = 1
+        workbook.save(tmp_path / "customers.xlsx")
+        rows = CustomerSpreadSheet().stream(tmp_path / "customers.xlsx")
+        assert [row["code"].value for row in rows] == [1]
+
+    def test_styled_empty_header(self, tmp_path):
+        workbook = Workbook()
+        sheet = workbook.active
+        for row in [["name", "Code"], ["Foo", 1]]:
+            sheet.append(row)
+        sheet.cell(row=1, column=3).font = Font(bold=True)
+        sheet.cell(row=2, column=3).font = Font(bold=True)
+        workbook.save(tmp_path / "styled.xlsx")
+        rows = CustomerSpreadSheet().stream(tmp_path / "styled.xlsx")
+        assert [row["code"].value for row in rows] == [1]
+
+    def test_invalid_headers(self, tmp_path):
+        path = write_workbook(tmp_path / "invalid.xlsx", [["name"], ["Foo"]])
+        with pytest.raises(InvalidHeaderException):
+            CustomerSpreadSheet().stream(path)
+
+
+class TestCheckpoints:
+    @pytest.fixture
+    def path(self, tmp_path):
+        return write_workbook(
+            tmp_path / "large.xlsx",
+            [["name", "Code"]] + [[f"name{idx}", idx] for idx in range(5)],
+        )
+
+    def test_resume_stream(self, tmp_path, path):
+        store = CheckpointStore(FileStore(tmp_path / "checkpoints.json"))
+        sheet = CustomerSpreadSheet()
+        checkpoint = sheet.checkpoint_for(path, store)
+        for row in sheet.stream(path, chunk_size=2, checkpoint=checkpoint):
+            store.save(sheet.checkpoint)
+            if row["code"].value == 2:
+                break
+
+        sheet = CustomerSpreadSheet()
+        checkpoint = sheet.checkpoint_for(path, store)
+        assert checkpoint.offset == 3
+        rows = sheet.stream(path, chunk_size=2, checkpoint=checkpoint)
+        assert [row["code"].value for row in rows] == [3, 4]
+        assert sheet.checkpoint.offset == 5
+
+    def test_resume_stream_with_unique(self, path):
+        class UniqueSpreadSheet(CustomerSpreadSheet):
+            unique_together = [("name",)]
+
+        sheet = UniqueSpreadSheet()
+        checkpoint = sheet.checkpoint_for(path).advance(3)
+        rows = list(sheet.stream(path, checkpoint=checkpoint))
+        assert [row["code"].value for row in rows] == [3, 4]
+
+    def test_resume_rows(self, path):
+        sheet = CustomerSpreadSheet()
+        checkpoint = sheet.checkpoint_for(path).advance(2)
+        sheet.load(path, checkpoint=checkpoint)
+        rows = sheet.rows()
+        assert [row["code"].value for row in rows] == [2, 3, 4]
+        assert sheet.checkpoint.advance(rows.offset).offset == 5
+
+    def test_other_file(self, path, customers_file):
+        sheet = CustomerSpreadSheet()
+        checkpoint = sheet.checkpoint_for(customers_file)
+        with pytest.raises(CheckpointException):
+            sheet.load(path, checkpoint=checkpoint)
+        with pytest.raises(CheckpointException):
+            OrderSpreadSheet().stream(customers_file, checkpoint=checkpoint)
+
+
+class TestParseCache:
+    def test_second_load_is_cached(self, tmp_path, monkeypatch):
+        path = write_workbook(
+            tmp_path / "customers.xlsx",
+            [["name", "Code"], ["Foo", 1], ["Bar", None]],
+        )
+        cache = ParseCache(tmp_path / "cache")
+        sheet = CustomerSpreadSheet()
+        sheet.load(path, cache=cache)
+        errors = sheet.validate()
+
+        def read_frame(*args):
+            raise AssertionError("File parsed again")
+
+        monkeypatch.setattr(readers, "read_frame", read_frame)
+        cached = CustomerSpreadSheet()
+        cached.load(path, cache=cache)
+        pd.testing.assert_frame_equal(cached.df, sheet.df)
+        assert cached.validate() == errors
+        assert cached.rows()[1].errors == errors[1]
+        with pytest.raises(LimitExceededException):
+            CustomerSpreadSheet().load(path, cache=cache, max_rows=1)
+
+    def test_errors_of_custom_validators_not_cached(self, tmp_path):
+        class MinValue(validate.Validator):
+            def __init__(self, value):
+                self.value = value
+
+            def __call__(self, value):
+                if value < self.value:
+                    raise ValidationException(f"< {self.value}")
+
+        def spreadsheet_class(value):
+            class CodeSpreadSheet(SpreadSheet):
+                code = fields.IntegerField(validate=[MinValue(value)])
+
+            return CodeSpreadSheet
+
+        path = tmp_path / "codes.csv"
+        path.write_text("code\n10\n")
+        cache = ParseCache(tmp_path / "cache")
+        sheet = spreadsheet_class(0)()
+        sheet.load(path, cache=cache)
+        assert sheet.validate() == {}
+        sheet = spreadsheet_class(100)()
+        sheet.load(path, cache=cache)
+        assert sheet.validate() == {0: {"code": ["< 100"]}}
+
+
+class TestBatches:
+    @pytest.fixture
+    def sheet(self, tmp_path):
+        path = tmp_path / "customers.csv"
+        path.write_text(
+            "name,Code,created_on\n"
+            "Foo,1,2021-01-01\n"
+            "Bar,,2021-01-02\n"
+            "Baz,3,2021-01-03\n"
+        )
+        sheet = CustomerSpreadSheet()
+        sheet.load(path)
+        return sheet
+
+    def test_tuples(self, sheet):
+        batches = list(sheet.batches(size=2))
+        assert batches == [
+            [("Foo", 1, pd.Timestamp("2021-01-01"))],
+            [("Baz", 3, pd.Timestamp("2021-01-03"))],
+        ]
+        assert sheet.error_summary()["invalid_rows"] == 1
+
+    def test_one_pool_for_all_batches(self, sheet, monkeypatch):
+        pools = []
+        worker_pool = containers.worker_pool
+
+        def counting_pool(*args):
+            pools.append(worker_pool(*args))
+            return pools[-1]
+
+        monkeypatch.setattr(spreadsheet, "worker_pool", counting_pool)
+        monkeypatch.setattr(containers, "worker_pool", counting_pool)
+        sheet.workers = 2
+        assert list(sheet.batches(size=1)) == [
+            [("Foo", 1, pd.Timestamp("2021-01-01"))],
+            [("Baz", 3, pd.Timestamp("2021-01-03"))],
+        ]
+        assert len(pools) == 1
+
+    def test_kinds(self, sheet):
+        (records,) = sheet.batches(kind="records")
+        assert records.dtype.names == ("name", "code", "created_on")
+        assert len(records) == 2
+        (frame,) = sheet.batches(valid_only=False, kind="frame")
+        assert list(frame["code"]) == [1, pd.NA, 3]
+        with pytest.raises(ValueError):
+            next(sheet.batches(kind="dicts"))
+
+    def test_split(self, sheet):
+        valid, invalid = sheet.split()
+        assert list(valid["name"]) == ["Foo", "Baz"]
+        assert list(invalid["name"]) == ["Bar"]
+        assert list(invalid["errors"]) == [
+            {"code": ["Value must be integer", "Required field"]}
+        ]
+
+
+class TestUniqueTogether:
+    class VisitSpreadSheet(SpreadSheet):
+        name = fields.StringField()
+        code = fields.IntegerField(validate=[validate.Unique()])
+        created_on = fields.DateTimeField()
+        unique_together = [("name", "created_on")]
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return write_workbook(
+            tmp_path / "visits.xlsx",
+            [
+                ["name", "code", "created_on"],
+                ["Foo", 1, datetime.datetime(2021, 1, 1)],
+                ["Foo", 2, datetime.datetime(2021, 1, 2)],
+                ["Foo", 1, datetime.datetime(2021, 1, 1)],
+            ],
+        )
+
+    def test_load(self, path):
+        sheet = self.VisitSpreadSheet()
+        sheet.load(path)
+        assert sheet.rows()[2].errors == {
+            "code": ["Duplicate of row 2"],
+            "name": ["Duplicate of row 2"],
+            "created_on": ["Duplicate of row 2"],
+        }
+        assert list(sheet.validate()) == [2]
+
+    def test_stream(self, path):
+        sheet = self.VisitSpreadSheet()
+        rows = list(sheet.stream(path, chunk_size=1))
+        assert [bool(row.errors) for row in rows] == [False, False, True]
+        assert rows[2].errors["code"] == ["Duplicate of row 2"]
+
+
+class TestValidate:
+    def test_same_errors_as_rows(self, tmp_path):
+        path = write_workbook(
+            tmp_path / "customers.xlsx",
+            [["name", "Code"], ["Foo", 1], [None, "abc"]],
+        )
+        sheet = CustomerSpreadSheet()
+        sheet.load(path)
+        errors = sheet.validate()
+        assert errors == {
+            position: row.errors
+            for position, row in enumerate(sheet.rows())
+            if row.errors
+        }
+        assert errors[1]["code"] == ["Value must be integer"]
+
+
+class TestTemplate:
+    def test_headers(self):
+        workbook = load_workbook(CustomerSpreadSheet().template())
+        headers = [cell.value for cell in workbook.active[1]]
+        assert headers == ["name", "Code", "created_on"]
+
+    def test_cached_per_only(self):
+        sheet = CustomerSpreadSheet()
+        content = sheet.template(only=["name"]).getvalue()
+        assert sheet.template(only=["name"]).getvalue() == content
+        assert sheet.template(only=["name", "code"]).getvalue() != content
+
+    def test_cached_per_class(self):
+        class ProductSpreadSheet(SpreadSheet):
+            name = fields.StringField()
+
+        class SkuSpreadSheet(ProductSpreadSheet):
+            sku = fields.StringField()
+
+        ProductSpreadSheet().template()
+        workbook = load_workbook(SkuSpreadSheet().template())
+        assert [cell.value for cell in workbook.active[1]] == ["name", "sku"]
+
+
+class TestExport:
+    @pytest.fixture
+    def records(self):
+        return [
+            {"name": "Foo", "code": 1, "created_on": None},
+            {"name": "Bar", "code": 2, "extra": "ignored"},
+        ]
+
+    def read_rows(self, buffer):
+        workbook = load_workbook(buffer)
+        return [[cell.value for cell in row] for row in workbook.active]
+
+    def test_dicts(self, records):
+        buffer = BytesIO()
+        CustomerSpreadSheet().export(records, buffer)
+        assert self.read_rows(buffer) == [
+            ["name", "Code", "created_on"],
+            ["Foo", 1, None],
+            ["Bar", 2, None],
+        ]
+
+    def test_dataframe_with_only(self, records):
+        buffer = BytesIO()
+        df = pd.DataFrame(records)
+        CustomerSpreadSheet().export(df, buffer, only=["code", "name"])
+        assert self.read_rows(buffer) == [
+            ["Code", "name"],
+            [1, "Foo"],
+            [2, "Bar"],
+        ]
+
+    def test_chunked_generator(self, records):
+        def chunks():
+            yield records[:1]
+            yield pd.DataFrame(records[1:])
+
+        buffer = BytesIO()
+        CustomerSpreadSheet().export(chunks(), buffer, only=["name"])
+        assert self.read_rows(buffer) == [["name"], ["Foo"], ["Bar"]]
+
+    def test_round_trip(self, tmp_path, records):
+        path = tmp_path / "customers.xlsx"
+        sheet = CustomerSpreadSheet()
+        sheet.export(records, path, only=["name", "code"])
+        sheet.load(path)
+        assert [row["code"].value for row in sheet.rows()] == [1, 2]
+
+
+class TestLoad:
+    def test_csv(self, tmp_path):
+        path = tmp_path / "customers.csv"
+        path.write_text("name,Code\nFoo,1\nBar,\n")
+        sheet = CustomerSpreadSheet()
+        sheet.load(path)
+        assert list(sheet.df.columns) == ["name", "code"]
+        assert sheet.validate()[1]["code"] == [
+            "Value must be integer",
+            "Required field",
+        ]
+
+    def test_csv_blank_required_string(self, tmp_path):
+        class NamedSpreadSheet(SpreadSheet):
+            name = fields.StringField(validate=[validate.Required()])
+            code = fields.IntegerField()
+
+        path = tmp_path / "names.csv"
+        path.write_text("name,code\nFoo,1\n,2\n")
+        sheet = NamedSpreadSheet()
+        sheet.load(path)
+        assert sheet.validate()[1]["name"] == [
+            "Value must be string",
+            "Required field",
+        ]
+
+    def test_subclass_init_without_super(self, tmp_path):
+        class ImportSpreadSheet(CustomerSpreadSheet):
+            def __init__(self, source):
+                self.source = source
+
+        path = tmp_path / "customers.csv"
+        path.write_text("name,Code\nFoo,1\n")
+        sheet = ImportSpreadSheet("upload")
+        sheet.load(path)
+        assert list(sheet.validate()) == [0]
+        assert [row["code"].value for row in sheet.rows()] == [1]
+
+    def test_uploads(self, customers_file):
+        expected = CustomerSpreadSheet()
+        expected.load(customers_file)
+        content = customers_file.read_bytes()
+        for source in (content, memoryview(content), BytesIO(content)):
+            sheet = CustomerSpreadSheet()
+            sheet.load(source)
+            pd.testing.assert_frame_equal(sheet.df, expected.df)
+
+
+class OrderSpreadSheet(SpreadSheet):
+    number = fields.IntegerField(validate=[validate.Required()])
+    customer = fields.StringField()
+
+
+class TestLoadWorkbook:
+    @pytest.fixture
+    def path(self, tmp_path):
+        path = tmp_path / "workbook.xlsx"
+        with pd.ExcelWriter(path) as writer:
+            pd.DataFrame({"name": ["Foo"], "Code": [1]}).to_excel(
+                writer, sheet_name="Customers", index=False
+            )
+            pd.DataFrame(
+                {"number": [1, None], "customer": ["Foo"] * 2}
+            ).to_excel(writer, sheet_name="Orders", index=False)
+        return path
+
+    def test_loads_every_sheet(self, path):
+        sheets = spreadsheet.load_workbook(
+            path,
+            {"Customers": CustomerSpreadSheet, "Orders": OrderSpreadSheet},
+        )
+        assert isinstance(sheets["Customers"], CustomerSpreadSheet)
+        customer = sheets["Customers"].rows()[0]
+        assert customer["code"].value == 1
+        orders = sheets["Orders"]
+        assert list(orders.store.errors) == [1]
+        assert orders.rows()[1].errors["number"] == [
+            "Value must be integer",
+            "Required field",
+        ]
+
+    def test_missing_sheet(self, path):
+        with pytest.raises(InvalidSheetException):
+            spreadsheet.load_workbook(path, {"Products": OrderSpreadSheet})
+
+
+class TestExportErrors:
+    def test_highlights_invalid_cells(self, tmp_path):
+        path = write_workbook(
+            tmp_path / "customers.xlsx",
+            [
+                ["name", "Code", "created_on"],
+                ["Foo", 1, datetime.datetime(2021, 1, 1)],
+                ["Bar", "abc", datetime.datetime(2021, 1, 2)],
+            ],
+        )
+        sheet = CustomerSpreadSheet()
+        sheet.load(path)
+        buffer = BytesIO()
+        sheet.export_errors(buffer)
+
+        rows = list(load_workbook(buffer).active.rows)
+        assert [cell.value for cell in rows[0]] == [
+            "name",
+            "Code",
+            "created_on",
+        ]
+        assert [cell.value for cell in rows[2]] == [
+            "Bar",
+            "abc",
+            datetime.datetime(2021, 1, 2),
+        ]
+        assert rows[1][0].comment is None
+        assert rows[2][1].comment.text == "Value must be integer"
+        assert rows[2][1].fill.start_color.rgb == "00FFC7CE"
+
+
+class TestFailFast:
+    def test_stops_at_first_error(self, tmp_path):
+        path = tmp_path / "customers.csv"
+        path.write_text("name,Code\nFoo,1\nBar,\nBaz,\n")
+        sheet = CustomerSpreadSheet()
+        sheet.load(path, fail_fast=True)
+        assert list(sheet.validate()) == [0]
+        assert sheet.error_summary()["exhausted"]
+        assert [row["name"].value for row in sheet.rows()] == ["Foo"]
+        with pytest.raises(NotValidatedException):
+            sheet.rows()[2].errors
+
+
+class TestPreflight:
+    def test_headers_and_size(self, customers_file):
+        result = CustomerSpreadSheet().preflight(customers_file)
+        assert result.headers == ["name", "Code", "created_on"]
+        assert result.rows == 3
+        assert result.columns == 3
+
+    def test_invalid_headers(self, tmp_path):
+        path = write_workbook(tmp_path / "invalid.xlsx", [["foo"], ["Foo"]])
+        with pytest.raises(InvalidHeaderException):
+            CustomerSpreadSheet().preflight(path)
+
+    def test_limits(self, customers_file):
+        sheet = CustomerSpreadSheet()
+        with pytest.raises(LimitExceededException):
+            sheet.preflight(customers_file, max_rows=2)
+        with pytest.raises(LimitExceededException):
+            sheet.preflight(customers_file, max_columns=2)
+
+    def test_load_runs_preflight(self, customers_file):
+        with pytest.raises(LimitExceededException):
+            CustomerSpreadSheet().load(customers_file, max_rows=2)
+
+    def test_first_sheet_when_another_is_active(self, tmp_path):
+        workbook = Workbook()
+        workbook.active.append(["name", "Code"])
+        workbook.active.append(["Foo", 1])
+        workbook.create_sheet().append(["other"])
+        workbook.active = 1
+        workbook.save(tmp_path / "customers.xlsx")
+        sheet = CustomerSpreadSheet()
+        sheet.load(tmp_path / "customers.xlsx")
+        assert list(sheet.df["code"]) == [1]
+
+    def test_rewinds_file_objects(self, customers_file):
+        buffer = BytesIO(customers_file.read_bytes())
+        sheet = CustomerSpreadSheet()
+        sheet.load(buffer, max_rows=3)
+        assert len(sheet.df) == 3
+
+
+class TestDtypes:
+    def test_integer_column_with_blanks(self, tmp_path):
+        path = write_workbook(
+            tmp_path / "customers.xlsx",
+            [["name", "Code"], ["Foo", 1], ["Bar", None]],
+        )
+        sheet = CustomerSpreadSheet()
+        sheet.load(path)
+        assert str(sheet.df["code"].dtype) == "Int64"
+        assert sheet.df["name"].dtype == "string"
+        assert sheet.validate() == {
+            0: {"created_on": ["None not a valid datetime"]},
+            1: {
+                "code": ["Value must be integer", "Required field"],
+                "created_on": ["None not a valid datetime"],
+            },
+        }
+
+
+class TestStats:
+    def test_load_and_validate(self, tmp_path):
+        path = tmp_path / "customers.csv"
+        path.write_text("name,Code\nFoo,1\nBar,\n")
+        finished = []
+        stats = Stats(on_stage=lambda name, seconds: finished.append(name))
+        sheet = CustomerSpreadSheet(stats=stats)
+        sheet.load(path)
+        sheet.validate()
+        assert finished == [
+            "preflight",
+            "parse",
+            "rename",
+            "validate_headers",
+            "coerce",
+            "validate",
+        ]
+        metrics = stats.as_dict()
+        assert metrics["rows"] == 2
+        assert metrics["validator.code.Required.calls"] == 2
+        assert metrics["validator.code.Required.failures"] == 1
+        assert "stage.validate.rows_per_second" in metrics
+
+    def test_rows_counted_per_cell(self, customers_file):
+        stats = Stats()
+        sheet = CustomerSpreadSheet(stats=stats)
+        sheet.load(customers_file)
+        assert sheet.rows()[0].errors == {}
+        assert stats.validators[("code", "Required")]["calls"] == 1
+        assert "materialize" in stats.stages
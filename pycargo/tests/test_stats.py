@@ -0,0 +1,16 @@
+from pycargo import stats, validate
+
+
+class TestStats:
+    def test_stage_is_cumulative(self):
+        collector = stats.Stats()
+        with collector.stage("parse"):
+            pass
+        with collector.stage("parse"):
+            pass
+        assert list(collector.stages) == ["parse"]
+        assert collector.rows_per_second("validate") is None
+
+    def test_validator_names(self):
+        assert stats.validator_name(validate.Required()) == "Required"
+        assert stats.validator_name(len) == "len"
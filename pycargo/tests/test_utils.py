@@ -0,0 +1,13 @@
+from pycargo import utils
+
+
+class TestLRUCache:
+    def test_evicts_least_recently_used(self):
+        cache = utils.LRUCache(maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert len(cache) == 2
@@ -1,6 +1,8 @@
+import numpy as np
+import pandas as pd
 import pytest
 
-from pycargo import validate
+from pycargo import fields, validate
 from pycargo.exceptions import ValidationException
 
 
@@ -213,3 +215,134 @@ class TestRange:
         assert "Must be greater than 10 and less than 20." in str(
             excinfo.value
         )
+
+
+class TestColumn:
+    def test_required(self):
+        series = pd.Series([1.0, np.nan, 3.0])
+        mask, messages = validate.Required().column(series)
+        assert mask.tolist() == [False, True, False]
+        assert messages == ["Required field"]
+
+    def test_range_with_numeric_column(self):
+        series = pd.Series([5, 10, 15, 25])
+        mask, messages = validate.Range(min=10, max=20).column(series)
+        assert mask.tolist() == [True, False, False, True]
+        assert (
+            messages
+            == [
+                "Must be greater than or equal to 10 and less than or equal to 20."
+            ]
+            * 2
+        )
+
+    def test_range_skips_null_values(self):
+        series = pd.Series([5.0, np.nan])
+        mask, messages = validate.Range(min=10).column(series)
+        assert mask.tolist() == [True, False]
+
+    def test_equal(self):
+        series = pd.Series(["a", "b", None])
+        mask, messages = validate.Equal("a").column(series)
+        assert mask.tolist() == [False, True, True]
+        assert messages == ["Must be equal to a", "Must be equal to a"]
+
+    def test_oneof(self, oneof_validator):
+        series = pd.Series([1, 6, 3])
+        mask, messages = oneof_validator.column(series)
+        assert mask.tolist() == [False, True, False]
+        assert messages == ["6 should be in [1, 2, 3, 4]."]
+
+    def test_oneof_with_non_iterable(self):
+        series = pd.Series([1, 2])
+        mask, messages = validate.OneOf(12).column(series)
+        assert mask.tolist() == [True, True]
+
+    def test_noneof(self, noneof_validator):
+        series = pd.Series([1, 6, np.nan])
+        mask, messages = noneof_validator.column(series)
+        assert mask.tolist() == [True, False, False]
+        assert messages == ["1.0 should not be in [1, 2, 3, 4]."]
+
+    def test_custom_callable(self):
+        def is_positive(value):
+            if value <= 0:
+                raise ValidationException("Must be positive")
+
+        series = pd.Series([1, -1])
+        mask, messages = validate.column_errors(is_positive, series)
+        assert mask.tolist() == [False, True]
+        assert messages == ["Must be positive"]
+
+
+class TestMemoizedColumn:
+    def test_validates_distinct_values_once(self):
+        calls = []
+
+        def is_short(value):
+            calls.append(value)
+            if len(value) > 2:
+                raise ValidationException(f"{value} is too long")
+
+        series = pd.Series(["ab", "abc", "ab", "abc"] * 10)
+        mask, messages = validate.column_errors(is_short, series)
+        assert calls == ["ab", "abc"]
+        assert mask.tolist() == [False, True] * 20
+        assert messages == ["abc is too long"] * 20
+
+    def test_high_cardinality_is_not_grouped(self):
+        calls = []
+        series = pd.Series(range(10))
+        validate.column_errors(calls.append, series)
+        assert len(calls) == 10
+
+    def test_email_checked_once_per_distinct_value(self, monkeypatch):
+        calls = []
+
+        def email(value):
+            calls.append(value)
+            return "@" in value
+
+        monkeypatch.setattr(fields.validators, "email", email)
+        series = pd.Series(["a@b.com", "invalid"] * 50)
+        mask, messages = fields.EmailField().validate_type_column(series)
+        assert calls == ["a@b.com", "invalid"]
+        assert mask.tolist() == [False, True] * 50
+        assert messages == ["Invalid email"] * 50
+
+    def test_mixed_types_are_not_grouped(self):
+        calls = []
+        series = pd.Series([1, True, 1, True], dtype=object)
+        validate.column_errors(calls.append, series)
+        assert len(calls) == 4
+
+
+class TestChoices:
+    def test_large_choices_message_is_shortened(self):
+        validator = validate.OneOf(list(range(50000)))
+        with pytest.raises(ValidationException) as excinfo:
+            validator(-1)
+        message = excinfo.value.message
+        assert message.startswith("Must be one of [0, 1, 2,")
+        assert message.endswith("... 50000 choices]")
+
+    def test_unhashable_choices(self):
+        validator = validate.OneOf([[2], [1]])
+        validator([1])
+        with pytest.raises(ValidationException):
+            validator([3])
+
+    def test_string_choices_keep_substring_semantics(self):
+        validate.OneOf("abc")("ab")
+
+    def test_from_file(self, tmp_path):
+        path = tmp_path / "skus.txt"
+        path.write_text("A-1\nA-2\n\n")
+        validator = validate.OneOf.from_file(path)
+        validator("A-2")
+        with pytest.raises(ValidationException):
+            validator("A-3")
+        mask, messages = validate.NoneOf.from_file(path).column(
+            pd.Series(["A-1", "B-1"])
+        )
+        assert mask.tolist() == [True, False]
@@ -1,3 +1,11 @@
+import threading
+import typing
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
 def format_dict(dict_: dict) -> str:
     """Method to take a dictionary and
     return a string of comma seperated key, value
@@ -12,3 +20,51 @@ def format_dict(dict_: dict) -> str:
         pairs.append(f"{key}={value}")
 
     return ", ".join(pairs)
+
+
+def series_values(series: pd.Series) -> np.ndarray:
+    """Method to return the values of a column the way
+    cells see them. Datetime columns are returned as pandas
+    Timestamps instead of numpy datetime64 values and missing values
+    of nullable columns as NaN, the same as numpy columns.
+    """
+    if series.dtype.kind in "mM":
+        return series.astype(object).to_numpy()
+    if isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+        return series.to_numpy(dtype=object, na_value=np.nan)
+    return series.to_numpy()
+
+
+class LRUCache:
+    """Mapping like cache which keeps at most maxsize items,
+    the least recently used item is evicted first.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        self.maxsize = maxsize
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<LRUCache({len(self.items)}/{self.maxsize})>"
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, key: typing.Hashable, default: typing.Any = None):
+        with self.lock:
+            if key not in self.items:
+                return default
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def set(self, key: typing.Hashable, value: typing.Any) -> None:
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.items.clear()
@@ -1,7 +1,106 @@
+import bisect
+import hashlib
+import os
 import typing
+from collections import abc
+from itertools import islice
+
+import numpy as np
 import pandas as pd
 
 from pycargo.exceptions import ValidationException
+from pycargo.utils import series_values
+
+
+ColumnErrors = typing.Tuple[np.ndarray, typing.List[str]]
+
+# Columns with at most this ratio of distinct values to validated
+# values are validated once per distinct value, 0 disables it.
+memoize_ratio = 0.5
+# Number of values used to estimate the ratio before grouping.
+memoize_sample_size = 1000
+
+
+def get_error(validator: typing.Callable, value: typing.Any):
+    """Returns the error message of validator for value, or None."""
+    try:
+        validator(value)
+    except ValidationException as exc:
+        return exc.message
+    return None
+
+
+def group_values(
+    series: pd.Series, values: np.ndarray, positions: np.ndarray
+) -> typing.Optional[typing.Tuple[np.ndarray, np.ndarray]]:
+    """Groups the values at positions by distinct value if the column
+    has few distinct values. Returns the group code of each position
+    and the first position of every group, or None.
+    Only columns holding a single type of values are grouped since
+    equal values of different types, e.g. 1 and True, may not be
+    equally valid. Null values are grouped by their type.
+    """
+    if memoize_ratio <= 0 or len(positions) < 2:
+        return None
+    if series.dtype.kind not in "biufmM" and pd.api.types.infer_dtype(
+        series, skipna=True
+    ) not in ("string", "bytes", "categorical"):
+        return None
+
+    sample = values[positions[:memoize_sample_size]]
+    if len(pd.unique(sample)) > memoize_ratio * len(sample):
+        return None
+    codes, uniques = pd.factorize(values[positions])
+    if len(uniques) > memoize_ratio * len(positions):
+        return None
+
+    null_codes = {}
+    for idx in np.flatnonzero(codes == -1):
+        null_type = type(values[positions[idx]])
+        code = null_codes.setdefault(null_type, len(uniques) + len(null_codes))
+        codes[idx] = code
+    _, first = np.unique(codes, return_index=True)
+    return codes, positions[first]
+
+
+def column_errors(
+    validator: typing.Callable,
+    series: pd.Series,
+    candidates: typing.Optional[np.ndarray] = None,
+) -> ColumnErrors:
+    """Run the per-cell validator on the values of the column flagged
+    in candidates (all the values if None) and return a boolean mask
+    of invalid values along with their messages in the same order.
+    Messages always come from the per-cell validator so that both the
+    paths report the same errors.
+    Columns with few distinct values are validated once per distinct
+    value and the results are broadcast to all the rows.
+    """
+    values = series_values(series)
+    mask = np.zeros(len(values), dtype=bool)
+    if candidates is None:
+        positions = np.arange(len(values))
+    else:
+        positions = np.flatnonzero(candidates)
+
+    groups = group_values(series, values, positions)
+    if groups is None:
+        messages = []
+        for position in positions:
+            message = get_error(validator, values[position])
+            if message is not None:
+                mask[position] = True
+                messages.append(message)
+        return mask, messages
+
+    codes, first_positions = groups
+    group_messages = [
+        get_error(validator, values[position]) for position in first_positions
+    ]
+    failed = np.array([message is not None for message in group_messages])
+    invalid = failed[codes]
+    mask[positions[invalid]] = True
+    return mask, [group_messages[code] for code in codes[invalid]]
 
 
 class Validator:
@@ -13,6 +112,38 @@ class Validator:
     def _repr_args(self) -> str:
         return ""
 
+    def _fingerprint_args(self) -> str:
+        return self._repr_args()
+
+    def _choice_files(self) -> typing.Tuple["FileChoices", ...]:
+        return ()
+
+    def fingerprint(self) -> str:
+        """Description of the validator for the schema fingerprint.
+        Unlike repr it is never shortened, includes the error message
+        and is the same across processes.
+        """
+        cls = type(self)
+        error = getattr(self, "error", None)
+        return (
+            f"{cls.__module__}.{cls.__qualname__}"
+            f"({self._fingerprint_args()}, error={error!r})"
+        )
+
+    def _column_mask(self, series: pd.Series) -> typing.Optional[np.ndarray]:
+        """Vectorized check to be overriden by validators.
+        Returns a mask of values that may be invalid, values outside
+        the mask are treated as valid. None means every value
+        has to be checked by the per-cell validator.
+        """
+        return None
+
+    def column(self, series: pd.Series) -> ColumnErrors:
+        """Column form of the validator. Takes the whole column and
+        returns a boolean error mask and the error messages.
+        """
+        return column_errors(self, series, self._column_mask(series))
+
 
 class Required(Validator):
     default_message = "Required field"
@@ -27,6 +158,9 @@ class Required(Validator):
         if pd.isnull(value):
             raise ValidationException(self.error)
 
+    def _column_mask(self, series: pd.Series) -> np.ndarray:
+        return series.isna().to_numpy()
+
 
 class Range(Validator):
     message_min = "Must be {min_op} {{min}}."
@@ -93,6 +227,27 @@ class Range(Validator):
             )
             raise ValidationException(self._format_error(value, message))
 
+    def _column_mask(self, series: pd.Series) -> typing.Optional[np.ndarray]:
+        if series.dtype.kind not in "biuf":
+            return None
+        mask = pd.Series(False, index=series.index)
+        try:
+            if self.min is not None:
+                mask |= (
+                    series < self.min
+                    if self.min_inclusive
+                    else series <= self.min
+                ).fillna(False)
+            if self.max is not None:
+                mask |= (
+                    series > self.max
+                    if self.max_inclusive
+                    else series >= self.max
+                ).fillna(False)
+        except TypeError:
+            return None
+        return mask.to_numpy(dtype=bool)
+
 
 class Equal(Validator):
 
@@ -116,6 +271,203 @@ class Equal(Validator):
         if value != self.comparable:
             raise ValidationException(self._format_error(value))
 
+    def _column_mask(self, series: pd.Series) -> typing.Optional[np.ndarray]:
+        # pandas parses strings when comparing with datetimes
+        if series.dtype.kind in "mM" or not pd.api.types.is_scalar(
+            self.comparable
+        ):
+            return None
+        try:
+            mask = series != self.comparable
+        except TypeError:
+            return None
+        # Missing values of nullable columns compare as NA
+        return mask.fillna(True).to_numpy(dtype=bool)
+
+
+class Unique(Validator):
+    """
+    Value must not repeat in the column. Uniqueness is checked
+    across all the rows by a hash index of the values, see
+    containers.DuplicateIndex, a single value is always valid.
+    Missing values are never duplicates.
+    The error points to the first occurrence, {row} is its row number
+    in the spreadsheet where the header is row 1, {position} is its
+    position among the data rows starting from 0.
+    """
+
+    cross_row = True
+    default_message = "Duplicate of row {row}"
+
+    def __init__(self, error: typing.Optional[str] = None):
+        self.error = error or self.default_message
+
+    def _format_error(self, position: int) -> str:
+        return self.error.format(row=position + 2, position=position)
+
+    def __call__(self, value) -> None:
+        pass
+
+    def _column_mask(self, series: pd.Series) -> np.ndarray:
+        return np.zeros(len(series), dtype=bool)
+
+
+class SortedChoices:
+    """Sorted list of choices which can not be hashed,
+    membership is checked with binary search.
+    """
+
+    def __init__(self, items: typing.List):
+        self.items = sorted(items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, value: typing.Any) -> bool:
+        try:
+            idx = bisect.bisect_left(self.items, value)
+        except TypeError:
+            return value in self.items
+        return idx < len(self.items) and self.items[idx] == value
+
+
+def file_state(stat: os.stat_result) -> typing.Tuple[int, int]:
+    return stat.st_size, stat.st_mtime_ns
+
+
+class FileChoices:
+    """Choices loaded lazily from a text file, one choice per line."""
+
+    def __init__(self, path: str, encoding: str = "utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self.loaded_state = None
+
+    def __repr__(self) -> str:
+        return f"<choices from '{self.path}'>"
+
+    def fingerprint(self) -> str:
+        """The file is not read, its state is part of the schema
+        fingerprint, see Schema.fingerprint.
+        """
+        return f"file({self.path!r}, {self.encoding!r})"
+
+    def state(self) -> typing.Optional[typing.Tuple[int, int]]:
+        """Size and modification time of the file when the choices
+        were read, or now if they were not read yet. None if the file
+        does not exist.
+        """
+        if self.loaded_state is not None:
+            return self.loaded_state
+        try:
+            return file_state(os.stat(self.path))
+        except FileNotFoundError:
+            return None
+
+    def __iter__(self):
+        with open(self.path, encoding=self.encoding) as file:
+            self.loaded_state = file_state(os.fstat(file.fileno()))
+            for line in file:
+                line = line.strip()
+                if line:
+                    yield line
+
+
+class Choices:
+    """Membership lookup used by OneOf and NoneOf. Choices are
+    compiled on first use into a frozenset, or a SortedChoices if
+    they can not be hashed, so a lookup does not scan every choice.
+    Strings, sets, mappings and ranges already have fast lookups and
+    keep their own semantics of `in`.
+    """
+
+    max_repr = 20
+
+    def __init__(self, choices: typing.Any):
+        self.choices = choices
+        self.compiled = None
+        self.column_values = None
+
+    def __contains__(self, value: typing.Any) -> bool:
+        return value in self.compile()
+
+    def compile(self) -> typing.Any:
+        if self.compiled is None:
+            self.compiled = self._compile()
+        return self.compiled
+
+    def _compile(self) -> typing.Any:
+        choices = self.choices
+        if isinstance(
+            choices, (str, bytes, range, abc.Set, abc.Mapping)
+        ) or not isinstance(choices, abc.Iterable):
+            return choices
+        items = list(choices)
+        try:
+            return frozenset(items)
+        except TypeError:
+            pass
+        try:
+            return SortedChoices(items)
+        except TypeError:
+            return items
+
+    def isin_values(self) -> typing.Optional[typing.List]:
+        """Choices for Series.isin, None if isin would not match
+        the `in` operator for them.
+        """
+        compiled = self.compile()
+        if isinstance(
+            compiled, (str, bytes, range, abc.Mapping)
+        ) or not isinstance(compiled, abc.Iterable):
+            return None
+        if self.column_values is None:
+            self.column_values = list(compiled)
+        return self.column_values
+
+    def describe(self) -> typing.Any:
+        """Choices for error messages and repr. Small collections are
+        returned as given, large ones are shortened.
+        """
+        choices = self.choices
+        if isinstance(choices, abc.Sized):
+            if len(choices) <= self.max_repr:
+                return choices
+        elif not isinstance(choices, FileChoices) or self.compiled is None:
+            # Files are not read to describe them before their first use
+            return choices
+        compiled = self.compile()
+        if not isinstance(compiled, abc.Sized) or isinstance(compiled, range):
+            return choices
+        items = ", ".join(repr(item) for item in islice(compiled, 10))
+        return f"[{items}, ... {len(compiled)} choices]"
+
+    def files(self) -> typing.Tuple[FileChoices, ...]:
+        if isinstance(self.choices, FileChoices):
+            return (self.choices,)
+        return ()
+
+    def fingerprint(self) -> str:
+        """Digest of all the choices which does not depend on the
+        iteration order of sets, sequences keep their own order.
+        """
+        choices = self.choices
+        if isinstance(choices, FileChoices):
+            return choices.fingerprint()
+        if isinstance(choices, (str, bytes, range)) or not isinstance(
+            choices, abc.Iterable
+        ):
+            return repr(choices)
+        if isinstance(choices, abc.Sequence):
+            items = [repr(item) for item in choices]
+        else:
+            items = sorted(repr(item) for item in self.compile())
+        digest = hashlib.sha256("\n".join(items).encode()).hexdigest()
+        return f"{type(choices).__name__}({digest})"
+
 
 class OneOf(Validator):
     default_message = "Must be one of {choices}"
@@ -125,20 +477,48 @@ class OneOf(Validator):
     ):
         self.choices = choices
         self.error = error or self.default_message
+        self._choices = Choices(choices)
+
+    @classmethod
+    def from_file(
+        cls, path: str, error: typing.Optional[str] = None
+    ) -> "OneOf":
+        """Choices are read from the file, one per line,
+        when the validator is first used.
+        """
+        return cls(FileChoices(path), error)
 
     def _repr_args(self) -> str:
-        return f"choices={self.choices!r}"
+        return f"choices={self._choices.describe()!r}"
+
+    def _fingerprint_args(self) -> str:
+        return f"choices={self._choices.fingerprint()}"
+
+    def _choice_files(self) -> typing.Tuple[FileChoices, ...]:
+        return self._choices.files()
 
     def _format_error(self, value) -> str:
-        return self.error.format(choices=self.choices, value=value)
+        return self.error.format(choices=self._choices.describe(), value=value)
 
     def __call__(self, value):
         try:
-            if value not in self.choices:
+            if value not in self._choices:
                 raise ValidationException(self._format_error(value))
         except TypeError as err:
             raise ValidationException(self._format_error(value)) from err
 
+    def _column_mask(self, series: pd.Series) -> typing.Optional[np.ndarray]:
+        # isin parses strings against datetime columns, `in` does not
+        choices = self._choices.isin_values()
+        if choices is None or series.dtype.kind in "mM":
+            return None
+        try:
+            mask = ~series.isin(choices)
+        except TypeError:
+            return None
+        # NaN is matched by isin but not by `in`, recheck nulls per cell
+        return (mask | series.isna()).to_numpy(dtype=bool)
+
 
 class NoneOf(Validator):
     default_message = "Must be none of {iterable}"
@@ -148,16 +528,46 @@ class NoneOf(Validator):
     ):
         self.iterable = iterable
         self.error = error or self.default_message
+        self._iterable = Choices(iterable)
+
+    @classmethod
+    def from_file(
+        cls, path: str, error: typing.Optional[str] = None
+    ) -> "NoneOf":
+        """Values are read from the file, one per line,
+        when the validator is first used.
+        """
+        return cls(FileChoices(path), error)
 
     def _repr_args(self) -> str:
-        return f"iterable={self.iterable!r}"
+        return f"iterable={self._iterable.describe()!r}"
+
+    def _fingerprint_args(self) -> str:
+        return f"iterable={self._iterable.fingerprint()}"
+
+    def _choice_files(self) -> typing.Tuple[FileChoices, ...]:
+        return self._iterable.files()
 
     def _format_error(self, value: typing.Any) -> str:
-        return self.error.format(iterable=self.iterable, value=value)
+        return self.error.format(
+            iterable=self._iterable.describe(), value=value
+        )
 
     def __call__(self, value):
         try:
-            if value in self.iterable:
+            if value in self._iterable:
                 raise ValidationException(self._format_error(value))
         except TypeError as err:
             raise ValidationException(self._format_error(value)) from err
+
+    def _column_mask(self, series: pd.Series) -> typing.Optional[np.ndarray]:
+        # isin parses strings against datetime columns, `in` does not
+        iterable = self._iterable.isin_values()
+        if iterable is None or series.dtype.kind in "mM":
+            return None
+        try:
+            mask = series.isin(iterable)
+        except TypeError:
+            return None
+        # NaN is matched by isin but not by `in`, recheck nulls per cell
+        return (mask | series.isna()).to_numpy(dtype=bool)
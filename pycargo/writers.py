@@ -0,0 +1,46 @@
+import typing
+
+import numpy as np
+import pandas as pd
+
+
+ExportData = typing.Union[pd.DataFrame, typing.Iterable]
+
+
+def cell_value(value: typing.Any) -> typing.Any:
+    """Null values are written as empty cells."""
+    if value is None or value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def frame_records(
+    df: pd.DataFrame, names: typing.List[str], chunk_size: int = 10000
+) -> typing.Iterator[tuple]:
+    """Generator over the rows of the dataframe as tuples of values
+    in the order of names. Columns are converted chunk_size rows at
+    a time, missing columns are written as empty cells.
+    """
+    df = df.reindex(columns=names)
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start : start + chunk_size].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def iter_records(
+    data: ExportData, names: typing.List[str]
+) -> typing.Iterator[tuple]:
+    """Generator over the rows of data as tuples of values in the
+    order of names. Data can be a dataframe, a dict or an iterable of
+    these, e.g. a generator yielding chunks of dicts or dataframes.
+    """
+    if isinstance(data, pd.DataFrame):
+        yield from frame_records(data, names)
+    elif isinstance(data, dict):
+        yield tuple(cell_value(data.get(name)) for name in names)
+    else:
+        for item in data:
+            yield from iter_records(item, names)
@@ -19,5 +19,6 @@ setuptools.setup(
         "Operating System :: OS Independent",
     ],
     python_requires='>=3.6',
-    install_requires=['validators>=0.18.2,<2', 'openpyxl>=3.0.5,<4', 'pandas>=1.2.0,<2']
+    install_requires=['validators>=0.18.2,<2', 'openpyxl>=3.0.5,<4', 'pandas>=1.2.0,<2'],
+    extras_require={'arrow': ['pyarrow>=4.0.0']}
 )
\ No newline at end of file